@@ -10,10 +10,11 @@ async def scan_devices():
     
     print('Starting BLE scan...')
     try:
-        devices = await adapter.scan(timeout=10.0)
-        print(f'\nFound {len(devices)} devices:')
-        for device in devices:
-            print(f'Address: {device["address"]}, Name: {device["name"]}')
+        count = 0
+        async for device in adapter.scan_iter(timeout=10.0):
+            count += 1
+            print(f'Address: {device.address}, Name: {device.name}')
+        print(f'\nFound {count} devices')
     except Exception as e:
         print(f'Scan error: {str(e)}')
 
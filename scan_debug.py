@@ -1,12 +1,15 @@
 import asyncio
+import os
 import sys
 import platform
 from src.device.ble_adapter import BLEAdapter
 
+DEBUG = os.environ.get("HYDRA_BLE_DEBUG") == "1"
+_SYSINFO = f'Python version: {sys.version}\nPlatform: {platform.platform()}'
+
 async def scan_devices():
     # Print system info
-    print(f'Python version: {sys.version}')
-    print(f'Platform: {platform.platform()}')
+    print(_SYSINFO)
     
     adapter = BLEAdapter()
     print(f'\nBLE adapter available: {adapter.available}')
@@ -16,18 +19,20 @@ async def scan_devices():
     
     print('\nStarting BLE scan (10 second timeout)...')
     try:
-        devices = await adapter.scan(timeout=10.0)
-        print(f'\nFound {len(devices)} devices:')
-        for device in devices:
-            print(f'Address: {device["address"]}, Name: {device["name"]}')
+        count = 0
+        async for device in adapter.scan_iter(timeout=10.0):
+            count += 1
+            print(f'Address: {device.address}, Name: {device.name}')
+        print(f'\nFound {count} devices')
     except Exception as e:
         print(f'\nScan error: {str(e)}')
         print(f'Error type: {type(e).__name__}')
-        if hasattr(e, 'winerror'):
-            print(f'Windows error code: {e.winerror}')
-        import traceback
-        print('\nFull error traceback:')
-        traceback.print_exc()
+        if DEBUG:
+            if hasattr(e, 'winerror'):
+                print(f'Windows error code: {e.winerror}')
+            import traceback
+            print('\nFull error traceback:')
+            traceback.print_exc()
 
 if __name__ == '__main__':
     asyncio.run(scan_devices())
\ No newline at end of file
@@ -6,19 +6,64 @@ from bleak import BleakScanner
 from typing import Optional
 
 FLIPPER_NAME_PREFIX = "Flipper "  # Flipper Zero devices typically broadcast with this prefix
+# All known name prefixes, as one tuple for str.startswith
+FLIPPER_NAME_PREFIXES = (FLIPPER_NAME_PREFIX, "Flipper Zero")
+# Advertised service UUIDs (0x3080 | hardware colour); lets the OS drop everything else
+FLIPPER_SERVICE_UUIDS = [
+    "00003080-0000-1000-8000-00805f9b34fb",
+    "00003081-0000-1000-8000-00805f9b34fb",
+    "00003082-0000-1000-8000-00805f9b34fb",
+    "00003083-0000-1000-8000-00805f9b34fb",
+]
+AD_COMPLETE_LOCAL_NAME = 0x09
+
+def scanner_filters() -> dict:
+    """Backend-specific scanner filter arguments."""
+    if sys.platform.startswith("linux"):
+        # BlueZ only accepts or_patterns in passive mode; the name match then
+        # happens in bluetoothd/controller instead of in Python.
+        return {
+            "scanning_mode": "passive",
+            "bluez": {"or_patterns": [(0, AD_COMPLETE_LOCAL_NAME, FLIPPER_NAME_PREFIX.encode())]},
+        }
+    return {"service_uuids": FLIPPER_SERVICE_UUIDS}
 
 async def find_flipper() -> Optional[tuple[str, str]]:
     """Scan for Flipper Zero devices."""
     print("Scanning for Flipper Zero devices...")
     
     try:
-        devices = await BleakScanner.discover(timeout=5.0)
-        
-        flipper_devices = [
-            (device.address, device.name)
-            for device in devices
-            if device.name and device.name.startswith(FLIPPER_NAME_PREFIX)
-        ]
+        found = asyncio.Event()
+        flipper_devices = []
+
+        def on_detect(device, adv):
+            # The OS already filtered by name pattern/service UUID; the name
+            # check is a fallback for backends that ignore the filter.
+            # adv.local_name is parsed straight from the AD 0x08/0x09 field,
+            # device.name may go through the backend's property cache.
+            name = adv.local_name or device.name
+            if name and name.startswith(FLIPPER_NAME_PREFIXES):
+                if all(address != device.address for address, _ in flipper_devices):
+                    flipper_devices.append((device.address, name))
+                found.set()
+
+        async def run_scan(**filters):
+            async with BleakScanner(detection_callback=on_detect, **filters):
+                try:
+                    # Stop on the first advertisement instead of sitting out the timeout
+                    await asyncio.wait_for(found.wait(), timeout=5.0)
+                except asyncio.TimeoutError:
+                    pass
+
+        filters = scanner_filters()
+        try:
+            await run_scan(**filters)
+        except Exception as e:
+            if "bluez" not in filters:
+                raise
+            # Older BlueZ without advertisement monitor support
+            print(f"Passive pattern scan unavailable ({e}); falling back to active scan")
+            await run_scan(service_uuids=FLIPPER_SERVICE_UUIDS)
         
         if not flipper_devices:
             print("\nNo Flipper Zero devices found!")
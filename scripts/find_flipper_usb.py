@@ -1,35 +1,128 @@
 """Quick Flipper Zero USB detection and connection test."""
+import argparse
+import sys
+import threading
+from pathlib import Path
 import serial
+import serial.threaded
 import serial.tools.list_ports
 import time
 
-# Flipper Zero USB VID/PID combinations
-FLIPPER_DEVICES = [
-    (0x0483, 0x5740),  # Standard CDC mode
-    (0x0483, 0xdf11),  # DFU mode
-    (0x0483, 0x5741),  # CLI mode
-    (0x0483, 0x5742),  # Serial mode
-]
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.config.flipper_config import FLIPPER_USB_MODES
+
+# Flipper Zero USB mode keyed by (VID, PID): one lookup per port
+_FLIPPER_VIDPID_MODE = {vid_pid: mode for mode, vid_pid in FLIPPER_USB_MODES.items()}
+
+# comports() walks SetupAPI/sysfs on every call; reuse the result briefly
+_PORTS_TTL = 1.0
+_ports_cache = [0.0, ()]
+
+def _cached_ports(ttl=_PORTS_TTL):
+    """Return the serial port list, re-enumerating at most once per ``ttl``."""
+    now = time.monotonic()
+    if now - _ports_cache[0] > ttl:
+        _ports_cache[:] = [now, tuple(serial.tools.list_ports.comports())]
+    return _ports_cache[1]
 
 def find_flipper():
-    """Find Flipper Zero COM port."""
+    """Find Flipper Zero COM port. Returns ``(device, mode)`` or ``(None, None)``."""
     print("\nScanning for USB devices...")
-    for port in serial.tools.list_ports.comports():
+    for port in _cached_ports():
         print(f"\nFound device: {port.device}")
         print(f"Description: {port.description}")
         print(f"Hardware ID: {port.hwid}")
-        print(f"VID:PID = {port.vid:04x}:{port.pid:04x}")
+        if port.vid is not None:
+            print(f"VID:PID = {port.vid:04x}:{port.pid:04x}")
         
         # Check if this is a Flipper Zero in any mode
-        for vid, pid in FLIPPER_DEVICES:
-            if port.vid == vid and port.pid == pid:
-                print("\nThis appears to be a Flipper Zero!")
-                return port.device
-    return None
+        mode = _FLIPPER_VIDPID_MODE.get((port.vid, port.pid))
+        if mode:
+            print(f"\nThis appears to be a Flipper Zero ({mode} mode)!")
+            return port.device, mode
+    return None, None
+
+def apply_aggressive_timeouts(ser):
+    """Make Windows reads return buffered bytes immediately.
+
+    Sets COMMTIMEOUTS to ReadIntervalTimeout=MAXDWORD with zero totals so
+    ReadFile never waits on the driver. This cuts per-command latency on
+    USB-CDC ports, but some drivers misbehave with it (hangs/bluescreens
+    have been reported), hence it is opt-in. Returns True if applied.
+    Must run after any pyserial timeout change, which resets COMMTIMEOUTS.
+    """
+    if sys.platform != "win32":
+        return False
+    import ctypes
+    import ctypes.wintypes as wintypes
+
+    class COMMTIMEOUTS(ctypes.Structure):
+        _fields_ = [
+            ("ReadIntervalTimeout", wintypes.DWORD),
+            ("ReadTotalTimeoutMultiplier", wintypes.DWORD),
+            ("ReadTotalTimeoutConstant", wintypes.DWORD),
+            ("WriteTotalTimeoutMultiplier", wintypes.DWORD),
+            ("WriteTotalTimeoutConstant", wintypes.DWORD),
+        ]
+
+    timeouts = COMMTIMEOUTS(0xFFFFFFFF, 0, 0, 0, 0)
+    return bool(ctypes.windll.kernel32.SetCommTimeouts(
+        ctypes.c_void_p(ser._port_handle), ctypes.byref(timeouts)
+    ))
+
+def read_available(ser, timeout=0.5, idle=0.05):
+    """Collect a reply from a port whose reads return immediately."""
+    data = bytearray()
+    deadline = time.monotonic() + timeout
+    last_rx = None
+    while time.monotonic() < deadline:
+        chunk = ser.read(4096)
+        if chunk:
+            data += chunk
+            last_rx = time.monotonic()
+        elif last_rx is not None and time.monotonic() - last_rx > idle:
+            break
+        else:
+            time.sleep(0.001)
+    return bytes(data)
+
+class ProbeBuffer(serial.threaded.Protocol):
+    """Accumulate raw CLI output from the reader thread; decoded once at the end."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.received = threading.Event()
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self.buffer += data
+        self.received.set()
+
+def collect_output(proto, timeout=1.0, idle=0.1):
+    """Wait for the first bytes, then until output stays quiet for ``idle``."""
+    if not proto.received.wait(timeout):
+        return b""
+    while True:
+        proto.received.clear()
+        if not proto.received.wait(idle):
+            return bytes(proto.buffer)
 
 def main():
+    parser = argparse.ArgumentParser(description="Find a Flipper Zero over USB")
+    parser.add_argument(
+        '--aggressive-timeouts',
+        action='store_true',
+        help='Windows only: return serial reads immediately (faster, may be unstable on some drivers)'
+    )
+    args = parser.parse_args()
+    
     print("Scanning for Flipper Zero...")
-    port = find_flipper()
+    port, mode = find_flipper()
     
     if not port:
         print("No Flipper Zero found! Please check:")
@@ -39,6 +132,10 @@ def main():
         return
     
     print(f"\nFound Flipper Zero on {port}")
+    if mode == "DFU":
+        # The bootloader has no CLI, so a device_info probe can only time out
+        print("Flipper is in DFU (bootloader) mode; reboot it to use the CLI.")
+        return
     print("Attempting to connect...")
     
     try:
@@ -53,24 +150,30 @@ def main():
         )
         print(f"Connected to {port}")
         
+        if hasattr(ser, "set_buffer_size"):  # Windows only
+            ser.set_buffer_size(rx_size=65536)
+        
         # Send device info request
         print("\nSending info request...")
-        ser.write(b'device_info\r\n')
-        time.sleep(0.5)
-        
-        # Read response
-        print("Waiting for response...")
-        attempts = 5
-        while attempts > 0:
-            if ser.in_waiting:
-                response = ser.readline().decode('utf-8', errors='ignore').strip()
-                if response:
-                    print(f"Received: {response}")
-            else:
-                attempts -= 1
-                time.sleep(0.5)
-                
-        if attempts == 0:
+        ser.timeout = 0.5
+        aggressive = args.aggressive_timeouts and apply_aggressive_timeouts(ser)
+        if aggressive:
+            print("Using immediate-return COMMTIMEOUTS")
+            ser.write(b'device_info\r\n')
+            print("Waiting for response...")
+            chunk = read_available(ser)
+        else:
+            # A dedicated reader thread drains multi-line output as it arrives
+            with serial.threaded.ReaderThread(ser, ProbeBuffer) as proto:
+                proto.transport.write(b'device_info\r\n')
+                print("Waiting for response...")
+                chunk = collect_output(proto)
+        # One decode over the whole reply rather than one per line
+        lines = [line for line in chunk.decode('utf-8', errors='ignore').splitlines() if line.strip()]
+        if lines:
+            for line in lines:
+                print(f"Received: {line}")
+        else:
             print("\nNo response received. Please check:")
             print("1. CLI is enabled in Flipper's Settings -> System")
             print("2. Debug UART is enabled")
@@ -1,19 +1,28 @@
 """BLE scanning diagnostic script."""
 
 import asyncio
+import os
+import platform
 import sys
 from bleak import BleakScanner
 from bleak.backends.device import BLEDevice
 from bleak.backends.scanner import AdvertisementData
 
+DEBUG = os.environ.get("HYDRA_BLE_DEBUG") == "1"
+_SYSINFO = f"Python version: {sys.version}\nPlatform: {platform.platform()}"
+
+# Attributes worth printing (HYDRA_BLE_DEBUG=1 only); avoids reflecting over every property
+DEVICE_FIELDS = ("address", "name", "details")
+ADV_FIELDS = ("local_name", "rssi", "tx_power", "service_uuids", "manufacturer_data", "service_data")
+
 async def scan_devices():
     """Scan for BLE devices and print detailed information."""
     print("Starting BLE scan...")
-    print(f"Python version: {sys.version}")
+    print(_SYSINFO)
     
     try:
         scanner = BleakScanner()
-        devices = await scanner.discover(timeout=10.0)
+        devices = await scanner.discover(timeout=10.0, return_adv=True)
         
         if not devices:
             print("No devices found! Please check if:")
@@ -23,19 +32,20 @@ async def scan_devices():
             return
             
         print(f"\nFound {len(devices)} devices:")
-        for device in devices:
+        for device, adv in devices.values():
             print("\nDevice Details:")
             print(f"Address: {device.address}")
             print(f"Name: {device.name or 'Unknown'}")
+            print(f"RSSI: {adv.rssi}")
+            if not DEBUG:
+                continue
             print(f"Details: {device!r}")
-            for attr in dir(device):
-                if not attr.startswith('_'):
+            for source, fields in ((device, DEVICE_FIELDS), (adv, ADV_FIELDS)):
+                for attr in fields:
                     try:
-                        value = getattr(device, attr)
-                        if not callable(value):
-                            print(f"{attr}: {value}")
-                    except Exception:
-                        continue
+                        print(f"{attr}: {getattr(source, attr)}")
+                    except AttributeError:
+                        pass
                     
     except Exception as e:
         print(f"\nError during scan: {str(e)}")
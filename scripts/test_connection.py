@@ -4,7 +4,7 @@ import asyncio
 import logging
 import sys
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import json
 import argparse
 
@@ -43,30 +43,34 @@ class ConnectionTester:
             }
         }
         
-        # Test USB if available
+        # The transports are independent; give each test its own manager so
+        # both can run at once.
+        tests = {}
         if devices["usb"]:
             logger.info("Testing USB connection...")
-            success = await self.test_usb_connection(devices["usb"]["port"])
-            report["connection_tests"]["usb"] = {
-                "success": success[0],
-                "message": success[1]
-            }
-            
-        # Test BLE if available
+            tests["usb"] = self.test_usb_connection(devices["usb"]["port"], DeviceManager())
         if devices["ble"]:
             logger.info("Testing BLE connection...")
-            success = await self.test_ble_connection(devices["ble"]["address"])
-            report["connection_tests"]["ble"] = {
-                "success": success[0],
-                "message": success[1]
+            tests["ble"] = self.test_ble_connection(devices["ble"]["address"], DeviceManager())
+            
+        outcomes = await asyncio.gather(*tests.values(), return_exceptions=True)
+        for transport, outcome in zip(tests, outcomes):
+            if isinstance(outcome, Exception):
+                outcome = (False, f"{transport.upper()} test error: {outcome}")
+            report["connection_tests"][transport] = {
+                "success": outcome[0],
+                "message": outcome[1]
             }
             
         return report
         
-    async def test_usb_connection(self, port: str) -> tuple[bool, str]:
+    async def test_usb_connection(
+        self, port: str, device_manager: Optional[DeviceManager] = None
+    ) -> tuple[bool, str]:
         """Test USB connection."""
+        device_manager = device_manager or self.device_manager
         try:
-            success = await self.device_manager.connect(
+            success = await device_manager.connect(
                 ConnectionType.USB,
                 port=port
             )
@@ -75,18 +79,21 @@ class ConnectionTester:
                 return False, "Failed to establish USB connection"
                 
             # Test connection
-            test_result = await self.device_manager.test_connection()
-            await self.device_manager.disconnect()
+            test_result = await device_manager.test_connection()
+            await device_manager.disconnect()
             
             return test_result
             
         except Exception as e:
             return False, f"USB test error: {str(e)}"
             
-    async def test_ble_connection(self, address: str) -> tuple[bool, str]:
+    async def test_ble_connection(
+        self, address: str, device_manager: Optional[DeviceManager] = None
+    ) -> tuple[bool, str]:
         """Test BLE connection."""
+        device_manager = device_manager or self.device_manager
         try:
-            success = await self.device_manager.connect(
+            success = await device_manager.connect(
                 ConnectionType.BLE,
                 address=address
             )
@@ -95,8 +102,8 @@ class ConnectionTester:
                 return False, "Failed to establish BLE connection"
                 
             # Test connection
-            test_result = await self.device_manager.test_connection()
-            await self.device_manager.disconnect()
+            test_result = await device_manager.test_connection()
+            await device_manager.disconnect()
             
             return test_result
             
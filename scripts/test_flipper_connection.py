@@ -11,6 +11,7 @@ logger = logging.getLogger(__name__)
 async def main():
     """Test Flipper Zero BLE connection."""
     flipper = FlipperZeroBLE()
+    disconnected = False
     
     try:
         # Connect to the specific Flipper Zero we found
@@ -29,6 +30,7 @@ async def main():
             # Disconnect
             logger.info("Disconnecting...")
             await flipper.disconnect()
+            disconnected = True
             logger.info("Disconnected.")
         else:
             logger.error("Failed to connect to Flipper Zero")
@@ -36,7 +38,7 @@ async def main():
     except Exception as e:
         logger.error(f"Error during test: {e}")
     finally:
-        if flipper.is_connected():
+        if not disconnected and flipper.is_connected():
             await flipper.disconnect()
 
 if __name__ == "__main__":
@@ -14,6 +14,16 @@ FLIPPER_USB_MODES = {
     "SERIAL": (0x0483, 0x5742)  # Serial mode
 }
 
+# BLE advertisement service UUIDs. The firmware advertises 0x3080 OR'd with
+# the hardware colour (0x1 black, 0x2 white, 0x3 transparent), not the serial
+# service itself, so scanner-side filters have to match on these.
+BLE_ADV_SERVICE_UUIDS = (
+    "00003080-0000-1000-8000-00805f9b34fb",
+    "00003081-0000-1000-8000-00805f9b34fb",
+    "00003082-0000-1000-8000-00805f9b34fb",
+    "00003083-0000-1000-8000-00805f9b34fb",
+)
+
 # Serial Communication
 SERIAL_CONFIG = {
     "baudrate": 115200,
@@ -4,12 +4,25 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import sys
 import threading
 from collections.abc import Awaitable, Callable
 from typing import Any, Optional
 
+try:  # Optional: libuv-backed loop, faster socket/pipe I/O for bleak/BlueZ
+    import uvloop  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    uvloop = None
+
 logger = logging.getLogger(__name__)
 
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create the runtime loop, preferring uvloop where it is supported."""
+    if uvloop is not None and sys.platform != "win32":
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
 class AsyncRuntime:
     """Background asyncio runtime for GUI integrations."""
 
@@ -24,7 +37,7 @@ class AsyncRuntime:
             if self._loop and self._loop.is_running():
                 return self._loop
 
-            loop = asyncio.new_event_loop()
+            loop = _new_event_loop()
             thread = threading.Thread(target=self._run_loop, args=(loop,), daemon=True)
             thread.start()
             self._loop = loop
@@ -1,51 +1,291 @@
-from typing import List, Dict, Any
+import asyncio
+import contextlib
+import weakref
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+try:
+    from bleak import BleakClient as _BLEAK_CLIENT_CLS  # type: ignore
+    from bleak import BleakScanner as _BLEAK_SCANNER_CLS  # type: ignore
+except Exception:
+    _BLEAK_CLIENT_CLS = None
+    _BLEAK_SCANNER_CLS = None
 
 
 class BLENotAvailable(RuntimeError):
     pass
 
 
+class BLEDeviceInfo:
+    """Lightweight scan result: address, name and last seen RSSI."""
+
+    __slots__ = ("address", "name", "rssi")
+
+    def __init__(self, address: Optional[str], name: Optional[str], rssi: Optional[int] = None):
+        self.address = address
+        self.name = name
+        self.rssi = rssi
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a plain dict, e.g. for JSON export."""
+        return {"address": self.address, "name": self.name, "rssi": self.rssi}
+
+    def __repr__(self) -> str:
+        return f"BLEDeviceInfo(address={self.address!r}, name={self.name!r}, rssi={self.rssi!r})"
+
+
+class _SharedScanner:
+    """One long-lived scanner fanned out to any number of listeners.
+
+    The OS scan is started when the first listener joins and stopped when
+    the last one leaves, so overlapping scans/iterators share a single
+    subscription instead of each re-registering with the backend.
+    """
+
+    def __init__(
+        self,
+        scanner_cls: Any,
+        service_uuids: Optional[Tuple[str, ...]],
+        scanning_mode: str,
+        backend_args: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        self._listeners: List[Callable[[Any, Any], None]] = []
+        self._active = 0
+        self._lock = asyncio.Lock()
+        self.scanner = scanner_cls(
+            detection_callback=self._dispatch,
+            service_uuids=list(service_uuids) if service_uuids else None,
+            scanning_mode=scanning_mode,
+            **(backend_args or {}),
+        )
+
+    def _dispatch(self, device: Any, adv: Any) -> None:
+        for callback in tuple(self._listeners):
+            callback(device, adv)
+
+    @contextlib.asynccontextmanager
+    async def listen(self, callback: Callable[[Any, Any], None]) -> AsyncIterator[None]:
+        """Deliver advertisements to ``callback`` while the block runs."""
+        async with self._lock:
+            # Register first so advertisements arriving during start() count
+            self._listeners.append(callback)
+            if self._active == 0:
+                try:
+                    await self.scanner.start()
+                except BaseException:
+                    self._listeners.remove(callback)
+                    raise
+            self._active += 1
+        try:
+            yield
+        finally:
+            self._listeners.remove(callback)
+            async with self._lock:
+                self._active -= 1
+                if self._active == 0:
+                    await self.scanner.stop()
+
+
+def _freeze(value: Any) -> Any:
+    """Turn nested dict/list scanner options into a hashable cache key."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+# Backends bind the running loop when the scanner is built (CoreBluetooth's
+# delegate does), and scripts call asyncio.run repeatedly, so scanners are
+# cached per loop. A scanner may itself reference its loop, so entries for
+# closed loops are also pruned explicitly.
+_SHARED_SCANNERS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Any, _SharedScanner]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def shared_scanner(
+    scanner_cls: Any,
+    service_uuids: Optional[Tuple[str, ...]],
+    scanning_mode: str,
+    backend_args: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> _SharedScanner:
+    """Return the running loop's scanner for one filter set.
+
+    Callers passing the same class, filters, mode and backend args get the
+    same scanner, so their listeners share one OS scan. Reusing the scanner
+    keeps the backend (e.g. the BlueZ D-Bus proxy) alive between scans
+    instead of rebuilding it for every call.
+    """
+    loop = asyncio.get_running_loop()
+    scanners = _SHARED_SCANNERS.get(loop)
+    if scanners is None:
+        for stale in [other for other in _SHARED_SCANNERS if other.is_closed()]:
+            del _SHARED_SCANNERS[stale]
+        scanners = _SHARED_SCANNERS[loop] = {}
+    key = (scanner_cls, service_uuids, scanning_mode, _freeze(backend_args or {}))
+    shared = scanners.get(key)
+    if shared is None:
+        shared = scanners[key] = _SharedScanner(
+            scanner_cls, service_uuids, scanning_mode, backend_args
+        )
+    return shared
+
+
 class BLEAdapter:
     """A minimal BLE adapter wrapper.
 
     - Uses `bleak` if available.
     - Exposes small, testable async methods (scan/connect) that can be
       mocked in unit tests.
+    - Optional ``service_uuids`` are handed to the OS scanner so only matching
+      advertisements reach Python.
+    - ``backend_args`` are passed through to `BleakScanner` as backend
+      keywords, e.g. ``{"bluez": {...}, "cb": {"use_bdaddr": False}}``.
     """
 
-    def __init__(self):
-        try:
-            from bleak import BleakScanner  # type: ignore
-            from bleak import BleakClient  # type: ignore
-
-            self._BleakScanner = BleakScanner
-            self._BleakClient = BleakClient
-            self._available = True
-            self._client = None
-        except Exception:
-            self._BleakScanner = None
-            self._BleakClient = None
-            self._client = None
-            self._available = False
+    def __init__(
+        self,
+        service_uuids: Optional[List[str]] = None,
+        scanning_mode: str = "active",
+        backend_args: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        self._service_uuids = list(service_uuids) if service_uuids else None
+        self._scanning_mode = scanning_mode
+        self._backend_args = dict(backend_args) if backend_args else {}
+        self._BleakScanner = _BLEAK_SCANNER_CLS
+        self._BleakClient = _BLEAK_CLIENT_CLS
+        self._client = None
+        self._available = _BLEAK_SCANNER_CLS is not None and _BLEAK_CLIENT_CLS is not None
+        self._scan_inflight: "Optional[asyncio.Future[List[BLEDeviceInfo]]]" = None
+        self._scan_deadline = 0.0
 
     @property
     def available(self) -> bool:
         return self._available
 
-    async def scan(self, timeout: float = 5.0) -> List[Dict[str, Any]]:
-        """Scan for nearby BLE devices and return simplified dicts.
+    def _scanner_options(
+        self, scanning_mode: str
+    ) -> Tuple[Optional[List[str]], Dict[str, Dict[str, Any]]]:
+        """Return ``(service_uuids, backend_args)`` for a scan in ``scanning_mode``."""
+        return self._service_uuids, self._backend_args
+
+    def _shared(self, scanning_mode: Optional[str] = None) -> _SharedScanner:
+        mode = scanning_mode or self._scanning_mode
+        service_uuids, backend_args = self._scanner_options(mode)
+        return shared_scanner(
+            self._BleakScanner,
+            tuple(service_uuids) if service_uuids else None,
+            mode,
+            backend_args,
+        )
+
+    async def scan(
+        self,
+        timeout: float = 5.0,
+        stop_predicate: Optional[Callable[[BLEDeviceInfo], bool]] = None,
+        scanning_mode: Optional[str] = None,
+        callback: Optional[Callable[[BLEDeviceInfo], None]] = None,
+    ) -> List[BLEDeviceInfo]:
+        """Scan for nearby BLE devices and return `BLEDeviceInfo` records.
+
+        When ``stop_predicate`` is given the scan ends as soon as it returns
+        True for a detected device; ``timeout`` is then only an upper bound.
+        A plain scan issued while another one is running shares its result
+        instead of occupying the radio again, provided the running scan ends
+        within this call's ``timeout``; otherwise it runs its own scan (still
+        on the shared OS subscription). ``scanning_mode`` overrides
+        the adapter default for this call. ``callback`` is invoked on the
+        event loop the first time each address is seen, in the same order
+        as the returned list.
 
         If `bleak` is not available this raises `BLENotAvailable`.
         """
         if not self._available:
             raise BLENotAvailable("bleak is not installed or not usable in this environment")
 
-        scanner = self._BleakScanner
-        devices = await scanner.discover(timeout=timeout)
-        result: List[Dict[str, Any]] = []
-        for d in devices:
-            result.append({"address": getattr(d, "address", None), "name": getattr(d, "name", None)})
-        return result
+        if (
+            stop_predicate is not None
+            or callback is not None
+            or scanning_mode not in (None, self._scanning_mode)
+        ):
+            return await self._do_scan(timeout, stop_predicate, scanning_mode, callback)
+
+        # No await between the check and the assignment, so callers on the
+        # loop cannot race here.
+        deadline = asyncio.get_running_loop().time() + timeout
+        if self._scan_inflight is None or self._scan_inflight.done():
+            self._scan_inflight = asyncio.ensure_future(self._do_scan(timeout, None, None))
+            self._scan_deadline = deadline
+        elif self._scan_deadline > deadline:
+            # Joining would block past this caller's own timeout
+            return await self._do_scan(timeout, None, None)
+        return list(await asyncio.shield(self._scan_inflight))
+
+    async def _do_scan(
+        self,
+        timeout: float,
+        stop_predicate: Optional[Callable[[BLEDeviceInfo], bool]],
+        scanning_mode: Optional[str],
+        callback: Optional[Callable[[BLEDeviceInfo], None]] = None,
+    ) -> List[BLEDeviceInfo]:
+        found = asyncio.Event()
+        # Each device advertises several times per event; keep one entry per
+        # address and let later beacons refresh the RSSI.
+        seen: Dict[Optional[str], BLEDeviceInfo] = {}
+
+        def _on_detect(device: Any, adv: Any) -> None:
+            info = BLEDeviceInfo(
+                getattr(device, "address", None),
+                getattr(device, "name", None),
+                getattr(adv, "rssi", None),
+            )
+            new = info.address not in seen
+            seen[info.address] = info
+            if new and callback is not None:
+                callback(info)
+            if stop_predicate is not None and stop_predicate(info):
+                found.set()
+
+        async with self._shared(scanning_mode).listen(_on_detect):
+            try:
+                await asyncio.wait_for(found.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return list(seen.values())
+
+    async def scan_iter(self, timeout: float = 5.0) -> AsyncIterator[BLEDeviceInfo]:
+        """Yield each newly seen BLE device as it is detected.
+
+        Unlike `scan`, results are produced as soon as an advertisement
+        arrives; the generator finishes when ``timeout`` elapses.
+
+        If `bleak` is not available this raises `BLENotAvailable`.
+        """
+        if not self._available:
+            raise BLENotAvailable("bleak is not installed or not usable in this environment")
+
+        queue: "asyncio.Queue[Tuple[Any, Any]]" = asyncio.Queue()
+        seen = set()
+
+        def _on_detect(device: Any, adv: Any) -> None:
+            queue.put_nowait((device, adv))
+
+        async with self._shared().listen(_on_detect):
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    device, adv = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                address = getattr(device, "address", None)
+                if address in seen:
+                    continue
+                seen.add(address)
+                yield BLEDeviceInfo(address, getattr(device, "name", None), getattr(adv, "rssi", None))
 
     async def connect(self, address: str, timeout: float = 10.0) -> bool:
         """Connect to a BLE device by address."""
@@ -69,6 +309,12 @@ class BLEAdapter:
         """Return connection state."""
         return self._client is not None and getattr(self._client, "is_connected", False)
 
+    async def get_services(self) -> Any:
+        """Return the GATT services resolved for the connected device."""
+        if self._client is None or not self.is_connected():
+            raise RuntimeError("Not connected to any BLE device")
+        return self._client.services
+
     async def read_characteristic(self, char_uuid: str) -> bytes:
         """Read a BLE characteristic by UUID."""
         if self._client is None or not self.is_connected():
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from enum import Enum
 from typing import Any, Dict, Optional, Tuple
 
@@ -15,6 +17,9 @@ from .flipper_transport import (
 
 logger = logging.getLogger(__name__)
 
+# Largest slice handed to a transport in one write when sending buffers
+TRANSMIT_CHUNK_SIZE = 1024
+
 
 class ConnectionType(str, Enum):
     USB = "usb"
@@ -43,17 +48,25 @@ class DeviceManager:
             transports[ConnectionType.MOCK] = MockTransport()
 
         self._transports = transports
-        self._status_callbacks: list[Any] = []
+        # Immutable snapshot, replaced on (rare) registration changes so
+        # status updates can iterate it without copying.
+        self._status_callbacks: Tuple[Any, ...] = ()
         self.status = ConnectionStatus.DISCONNECTED
         self.connection_type: Optional[ConnectionType] = None
         self.active_transport: Optional[FlipperTransport] = None
+        # Recent scan results per transport, shared by back-to-back callers
+        self._scan_ttl = 3.0
+        self._scan_cache: Dict[str, Tuple[float, Any]] = {}
+        self._scan_lock = asyncio.Lock()
 
     def add_status_callback(self, callback) -> None:
-        self._status_callbacks.append(callback)
+        self._status_callbacks += (callback,)
 
     def remove_status_callback(self, callback) -> None:
         if callback in self._status_callbacks:
-            self._status_callbacks.remove(callback)
+            callbacks = list(self._status_callbacks)
+            callbacks.remove(callback)
+            self._status_callbacks = tuple(callbacks)
 
     def available_transports(self) -> Dict[ConnectionType, TransportStatus]:
         return {
@@ -63,23 +76,30 @@ class DeviceManager:
 
     def _update_status(self, status: ConnectionStatus) -> None:
         self.status = status
-        for callback in list(self._status_callbacks):
+        callbacks = self._status_callbacks
+        if not callbacks:
+            return
+        for callback in callbacks:
             try:
                 callback(status)
             except Exception as exc:  # pragma: no cover - defensive log
                 logger.error("Status callback failure: %s", exc)
 
-    async def scan_devices(self) -> Dict[str, Any]:
-        devices: Dict[str, Any] = {"usb": None, "ble": None}
+    def invalidate_scan_cache(self) -> None:
+        self._scan_cache.clear()
 
+    async def _scan_usb(self) -> Optional[Dict[str, Any]]:
         usb_transport = self._transports.get(ConnectionType.USB)
         if usb_transport:
             usb_status = usb_transport.availability()
             if usb_status.available:
-                detected = FlipperUSBTransport.find_flipper_port()
+                # comports() is a blocking OS walk; keep it off the event loop
+                detected = await asyncio.to_thread(FlipperUSBTransport.find_flipper_port)
                 if detected:
-                    devices["usb"] = {"port": detected[0], "vid_pid": detected[1]}
+                    return {"port": detected[0], "vid_pid": detected[1]}
+        return None
 
+    async def _scan_ble(self) -> Optional[Dict[str, Any]]:
         ble_transport = self._transports.get(ConnectionType.BLE)
         if ble_transport:
             ble_status = ble_transport.availability()
@@ -87,11 +107,33 @@ class DeviceManager:
                 try:
                     address = await FlipperBLETransport.find_flipper_device()
                     if address:
-                        devices["ble"] = {"address": address}
+                        return {"address": address}
                 except Exception as exc:
                     logger.error("BLE scan error: %s", exc)
+        return None
 
-        return devices
+    async def scan_devices(self) -> Dict[str, Any]:
+        # Concurrent callers queue on the lock and then hit the fresh cache
+        # instead of starting their own scans.
+        async with self._scan_lock:
+            devices: Dict[str, Any] = {}
+            pending = []
+            for key, scan in (("usb", self._scan_usb), ("ble", self._scan_ble)):
+                cached = self._scan_cache.get(key)
+                if cached and time.monotonic() - cached[0] < self._scan_ttl:
+                    devices[key] = cached[1]
+                else:
+                    pending.append((key, scan()))
+
+            # USB enumeration and the BLE scan are independent; overlap them
+            results = await asyncio.gather(*(coro for _, coro in pending), return_exceptions=True)
+            for (key, _), result in zip(pending, results):
+                if isinstance(result, Exception):
+                    logger.error("%s scan error: %s", key.upper(), result)
+                    result = None
+                devices[key] = result
+                self._scan_cache[key] = (time.monotonic(), result)
+            return {key: devices[key] for key in ("usb", "ble")}
 
     async def connect(self, connection_type: ConnectionType, **kwargs: Any) -> bool:
         if self.status == ConnectionStatus.CONNECTED:
@@ -109,6 +151,8 @@ class DeviceManager:
             return False
 
         self._update_status(ConnectionStatus.CONNECTING)
+        # A connected Flipper stops advertising; don't serve stale results
+        self.invalidate_scan_cache()
 
         try:
             success = await transport.connect(**kwargs)
@@ -140,20 +184,23 @@ class DeviceManager:
         finally:
             self.active_transport = None
             self.connection_type = None
+            self.invalidate_scan_cache()
             self._update_status(ConnectionStatus.DISCONNECTED)
 
     def is_connected(self) -> bool:
         return self.status == ConnectionStatus.CONNECTED
 
     async def write(self, data: bytes) -> int:
-        if not self.is_connected() or not self.active_transport:
+        transport = self.active_transport
+        if transport is None or self.status is not ConnectionStatus.CONNECTED:
             raise ConnectionError("Device not connected")
-        return await self.active_transport.write(data)
+        return await transport.write(data)
 
     async def read(self, size: int = -1, timeout: Optional[float] = None) -> bytes:
-        if not self.is_connected() or not self.active_transport:
+        transport = self.active_transport
+        if transport is None or self.status is not ConnectionStatus.CONNECTED:
             raise ConnectionError("Device not connected")
-        return await self.active_transport.read(size, timeout)
+        return await transport.read(size, timeout)
 
     def get_connection_info(self) -> Optional[Dict[str, Any]]:
         if not self.is_connected():
@@ -178,33 +225,38 @@ class DeviceManager:
         if not self.is_connected():
             raise ConnectionError("Device not connected")
 
-        payload: Optional[bytes] = None
-
-        # Prefer decoded payloads, fall back to raw data representations.
-        candidates = []
-        if hasattr(signal, "decoded_data"):
-            candidates.append(getattr(signal, "decoded_data"))
-        if hasattr(signal, "data"):
-            candidates.append(getattr(signal, "data"))
-        if hasattr(signal, "raw_samples"):
-            raw_samples = getattr(signal, "raw_samples")
-            try:
-                if raw_samples is not None:
-                    if hasattr(raw_samples, "tobytes"):
-                        candidates.append(raw_samples.tobytes())
-                    elif isinstance(raw_samples, (bytes, bytearray)):
-                        candidates.append(bytes(raw_samples))
-            except Exception as exc:  # pragma: no cover - defensive guard
-                logger.debug("Failed to coerce raw_samples to bytes: %s", exc)
-
-        for candidate in candidates:
-            if isinstance(candidate, (bytes, bytearray)) and candidate:
-                payload = bytes(candidate)
+        # Prefer decoded payloads, fall back to raw data representations;
+        # stop at the first usable one so raw_samples is only touched if needed.
+        payload: Optional[memoryview] = None
+        for attr in ("decoded_data", "data"):
+            candidate = getattr(signal, attr, None)
+            if isinstance(candidate, (bytes, bytearray, memoryview)) and len(candidate):
+                payload = memoryview(candidate).cast("B")
                 break
+        else:
+            raw_samples = getattr(signal, "raw_samples", None)
+            if raw_samples is not None:
+                try:
+                    # View the sample buffer as bytes instead of copying it
+                    payload = memoryview(raw_samples).cast("B")
+                except TypeError:
+                    # Non-contiguous arrays can't be viewed flat; copy those
+                    if hasattr(raw_samples, "tobytes"):
+                        payload = memoryview(raw_samples.tobytes())
+                except Exception as exc:  # pragma: no cover - defensive guard
+                    logger.debug("Failed to coerce raw_samples to bytes: %s", exc)
+                if payload is not None and not len(payload):
+                    payload = None
 
         if payload is None:
             logger.warning("Signal %s has no payload to transmit", signal)
             return False
 
-        written = await self.write(payload)
-        return written == len(payload)
\ No newline at end of file
+        written = 0
+        for start in range(0, len(payload), TRANSMIT_CHUNK_SIZE):
+            written += await self.write(payload[start:start + TRANSMIT_CHUNK_SIZE])
+        # Transports may buffer writes; only report success once sent
+        transport = self.active_transport
+        if transport is not None:
+            await transport.flush()
+        return written == len(payload)
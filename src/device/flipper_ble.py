@@ -1,27 +1,55 @@
 """Flipper Zero specific BLE adapter."""
 
 from typing import List, Dict, Any, Optional
+import json
 import logging
-from .ble_adapter import BLEAdapter
+import sys
+from pathlib import Path
+from .ble_adapter import BLEAdapter, BLEDeviceInfo
+from ..config.flipper_config import BLE_ADV_SERVICE_UUIDS
 
 logger = logging.getLogger(__name__)
 
+_FLIPPER_PREFIX = "Flipper "
+_FLIPPER_PREFIX_LEN = len(_FLIPPER_PREFIX)
+
+def _is_flipper_name(name: Optional[str]) -> bool:
+    """Prefix check kept at module level: it runs once per advertisement."""
+    return name is not None and name[:_FLIPPER_PREFIX_LEN] == _FLIPPER_PREFIX
+
 class FlipperZeroBLE(BLEAdapter):
     """Flipper Zero-specific BLE adapter with custom functionality."""
     
-    FLIPPER_NAME_PREFIX = "Flipper "
+    FLIPPER_NAME_PREFIX = _FLIPPER_PREFIX
     
     # Flipper Zero BLE Service UUIDs
     SERVICE_UUID = "00001800-0000-1000-8000-00805f9b34fb"  # Generic Access Service
     SERIAL_SERVICE_UUID = "8fe5b3d5-2e7f-4a98-2a48-7acc60fe0000"  # Flipper Serial Service
+    ADV_SERVICE_UUIDS = BLE_ADV_SERVICE_UUIDS  # Advertised, used for scan filtering
     
     # Characteristic UUIDs
     RX_CHAR_UUID = "8fe5b3d5-2e7f-4a98-2a48-7acc60fe0002"  # Read from Flipper
     TX_CHAR_UUID = "8fe5b3d5-2e7f-4a98-2a48-7acc60fe0003"  # Write to Flipper
     
+    # Lowercased once for discovery lookups
+    _SERIAL_SERVICE_UUID_LOWER = SERIAL_SERVICE_UUID.lower()
+    _RX_UUID_LOWER = RX_CHAR_UUID.lower()
+    _TX_UUID_LOWER = TX_CHAR_UUID.lower()
+    
+    # Last successfully connected address, tried before scanning
+    LAST_DEVICE_FILE = Path.home() / ".hydra" / "last_flipper.json"
+    CACHED_CONNECT_TIMEOUT = 3.0
+    
     def __init__(self):
         """Initialize the Flipper Zero BLE adapter."""
-        super().__init__()
+        # Active scanning is the low-latency mode on every backend (Android
+        # maps it to SCAN_MODE_LOW_LATENCY). CoreBluetooth keeps its per-host
+        # UUID addressing, which is what gets remembered in LAST_DEVICE_FILE.
+        super().__init__(
+            service_uuids=list(self.ADV_SERVICE_UUIDS),
+            scanning_mode="active",
+            backend_args={"cb": {"use_bdaddr": False}},
+        )
         self._device_info = None
         self._rx_characteristic = None
         self._tx_characteristic = None
@@ -29,45 +57,90 @@ class FlipperZeroBLE(BLEAdapter):
     @staticmethod
     def is_flipper_device(name: Optional[str]) -> bool:
         """Check if a device name matches Flipper Zero pattern."""
-        return bool(name and name.startswith(FlipperZeroBLE.FLIPPER_NAME_PREFIX))
+        return _is_flipper_name(name)
     
-    async def find_flipper(self) -> Optional[Dict[str, Any]]:
-        """Scan specifically for Flipper Zero devices."""
+    def _scanner_options(self, scanning_mode: str):
+        if scanning_mode == "passive" and sys.platform.startswith("linux"):
+            # BlueZ passive scans need an or_pattern and ignore UUID filters
+            return None, {"bluez": {"or_patterns": [(0, 0x09, self.FLIPPER_NAME_PREFIX.encode())]}}
+        return super()._scanner_options(scanning_mode)
+    
+    async def find_flipper(self, fast: bool = True) -> Optional[BLEDeviceInfo]:
+        """Scan specifically for Flipper Zero devices.
+        
+        ``fast`` uses active (low-latency) scanning; pass False for a
+        lower duty-cycle passive scan where the backend supports it. The
+        scan stops at the first Flipper seen; 5 seconds is only the cap.
+        """
         try:
-            devices = await self.scan(timeout=5.0)
+            devices = await self.scan(
+                timeout=5.0,
+                stop_predicate=lambda device: _is_flipper_name(device.name),
+                scanning_mode="active" if fast else "passive",
+            )
             for device in devices:
-                if self.is_flipper_device(device.get("name")):
+                if self.is_flipper_device(device.name):
                     return device
             return None
         except Exception as e:
             logger.error(f"Error finding Flipper Zero: {e}")
             return None
     
+    def _load_last_address(self) -> Optional[str]:
+        """Return the remembered Flipper address, if any."""
+        try:
+            with open(self.LAST_DEVICE_FILE, "r", encoding="utf-8") as fh:
+                return json.load(fh).get("address") or None
+        except (OSError, ValueError, AttributeError):
+            return None
+    
+    def _save_last_address(self, address: str) -> None:
+        """Remember ``address`` for the next connect_to_flipper() call."""
+        try:
+            self.LAST_DEVICE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.LAST_DEVICE_FILE, "w", encoding="utf-8") as fh:
+                json.dump({"address": address}, fh)
+        except OSError as e:
+            logger.debug(f"Could not remember Flipper address: {e}")
+    
     async def connect_to_flipper(self, address: Optional[str] = None) -> bool:
-        """Connect to a Flipper Zero device with proper service discovery."""
+        """Connect to a Flipper Zero device with proper service discovery.
+        
+        Without an explicit ``address`` the last known Flipper is tried
+        directly first; a scan only runs if that fails.
+        """
         try:
+            connected = False
+            if not address:
+                cached = self._load_last_address()
+                if cached:
+                    try:
+                        connected = await self.connect(cached, timeout=self.CACHED_CONNECT_TIMEOUT)
+                    except Exception as e:
+                        logger.info(f"Last known Flipper {cached} unreachable: {e}")
+                    if connected:
+                        address = cached
+            
             if not address:
                 device = await self.find_flipper()
                 if not device:
                     logger.error("No Flipper Zero found during scan")
                     return False
-                address = device.get("address")
+                address = device.address
             
             if not address:
                 logger.error("No valid Flipper Zero address available")
                 return False
                 
-            connected = await self.connect(address)
+            if not connected:
+                connected = await self.connect(address)
             if not connected:
                 return False
                 
             # Get Flipper's Serial Service
             services = await self.get_services()
-            serial_service = next(
-                (service for service in services 
-                 if service.uuid.lower() == self.SERIAL_SERVICE_UUID.lower()),
-                None
-            )
+            services_by_uuid = {service.uuid.lower(): service for service in services}
+            serial_service = services_by_uuid.get(self._SERIAL_SERVICE_UUID_LOWER)
             
             if not serial_service:
                 logger.error("Flipper Zero Serial Service not found")
@@ -76,9 +149,10 @@ class FlipperZeroBLE(BLEAdapter):
                 
             # Get RX/TX characteristics
             for char in serial_service.characteristics:
-                if char.uuid.lower() == self.RX_CHAR_UUID.lower():
+                char_uuid = char.uuid.lower()
+                if char_uuid == self._RX_UUID_LOWER:
                     self._rx_characteristic = char
-                elif char.uuid.lower() == self.TX_CHAR_UUID.lower():
+                elif char_uuid == self._TX_UUID_LOWER:
                     self._tx_characteristic = char
                     
             if not (self._rx_characteristic and self._tx_characteristic):
@@ -88,6 +162,7 @@ class FlipperZeroBLE(BLEAdapter):
                 
             logger.info(f"Successfully connected to Flipper Zero at {address}")
             self._device_info = {"address": address}
+            self._save_last_address(address)
             return True
             
         except Exception as e:
@@ -12,8 +12,37 @@ from dataclasses import dataclass
 from enum import Enum
 import time
 
+try:  # Optional C JSON codec; falls back to the stdlib
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# [Type][CommandID][CommandLen][ArgsLen][DataLen], compiled once
+_HEADER_STRUCT = struct.Struct('>BIIII')
+_HEADER_SIZE = _HEADER_STRUCT.size
+
+# Wire encoding of an empty args mapping; most pings carry no args
+_EMPTY_ARGS = b'{}'
+
+# In-flight responses live in a ring indexed by cmd_id & _RESPONSE_MASK
+_RESPONSE_SLOTS = 1024
+_RESPONSE_MASK = _RESPONSE_SLOTS - 1
+
+if orjson is not None:
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    _loads = orjson.loads
+else:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+    def _loads(data: Union[bytes, memoryview]) -> Any:
+        # stdlib json only takes str/bytes/bytearray
+        return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
 class FlipperProtocolError(Exception):
     """Base exception for protocol errors."""
     pass
@@ -25,7 +54,7 @@ class MessageType(Enum):
     EVENT = 2
     ERROR = 3
 
-@dataclass
+@dataclass(slots=True)
 class RPCMessage:
     """RPC message container."""
     type: MessageType
@@ -43,8 +72,12 @@ class FlipperProtocol:
     def __init__(self):
         """Initialize protocol handler."""
         self.command_id = 0
-        self._callbacks = {}
-        self._responses = {}
+        # event type -> insertion-ordered set of callbacks
+        self._callbacks: Dict[str, Dict[Any, None]] = {}
+        self._responses: List[Optional[asyncio.Future]] = [None] * _RESPONSE_SLOTS
+        self._response_ids: List[int] = [0] * _RESPONSE_SLOTS
+        # Used only when a slot is still held by an older command
+        self._overflow: Dict[int, asyncio.Future] = {}
         self._events = asyncio.Queue()
         
     def _get_next_command_id(self) -> int:
@@ -56,42 +89,56 @@ class FlipperProtocol:
         """Encode message to wire format."""
         # Format: [Type][CommandID][CommandLen][Command][ArgsLen][Args][DataLen][Data]
         command_bytes = msg.command.encode('utf-8')
-        args_bytes = json.dumps(msg.args).encode('utf-8')
+        args_bytes = _dumps(msg.args) if msg.args else _EMPTY_ARGS
         data_bytes = msg.data or b''
         
-        header = struct.pack(
-            '>BIIII',
+        cmd_len = len(command_bytes)
+        args_len = len(args_bytes)
+        data_len = len(data_bytes)
+        
+        # One buffer, filled in place, instead of header + ... concatenation
+        buf = bytearray(_HEADER_SIZE + cmd_len + args_len + data_len)
+        _HEADER_STRUCT.pack_into(
+            buf, 0,
             msg.type.value,
             msg.command_id,
-            len(command_bytes),
-            len(args_bytes),
-            len(data_bytes)
+            cmd_len,
+            args_len,
+            data_len
         )
+        offset = _HEADER_SIZE
+        buf[offset:offset + cmd_len] = command_bytes
+        offset += cmd_len
+        buf[offset:offset + args_len] = args_bytes
+        offset += args_len
+        buf[offset:] = data_bytes
         
-        return header + command_bytes + args_bytes + data_bytes
+        return bytes(buf)
         
     def decode_message(self, data: bytes) -> RPCMessage:
         """Decode message from wire format."""
         try:
             # Parse header
-            header_size = struct.calcsize('>BIIII')
-            if len(data) < header_size:
+            if len(data) < _HEADER_SIZE:
                 raise FlipperProtocolError("Message too short")
                 
-            msg_type, cmd_id, cmd_len, args_len, data_len = struct.unpack(
-                '>BIIII', data[:header_size]
-            )
+            # Slice a view so sections are not copied until materialised
+            view = memoryview(data)
+            msg_type, cmd_id, cmd_len, args_len, data_len = _HEADER_STRUCT.unpack_from(view, 0)
             
             # Parse sections
-            offset = header_size
-            command = data[offset:offset + cmd_len].decode('utf-8')
+            offset = _HEADER_SIZE
+            command = str(view[offset:offset + cmd_len], 'utf-8')
             offset += cmd_len
             
-            args_data = data[offset:offset + args_len].decode('utf-8')
-            args = json.loads(args_data) if args_data else {}
+            args_data = view[offset:offset + args_len]
+            if args_len == 0 or (args_len == 2 and args_data == _EMPTY_ARGS):
+                args = {}
+            else:
+                args = _loads(args_data)
             offset += args_len
             
-            msg_data = data[offset:offset + data_len] if data_len > 0 else None
+            msg_data = view[offset:offset + data_len].tobytes() if data_len > 0 else None
             
             return RPCMessage(
                 type=MessageType(msg_type),
@@ -101,6 +148,7 @@ class FlipperProtocol:
                 data=msg_data
             )
             
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
         except (struct.error, json.JSONDecodeError, ValueError) as e:
             raise FlipperProtocolError(f"Failed to decode message: {e}")
             
@@ -133,15 +181,19 @@ class FlipperProtocol:
             data=data
         )
         
-        # Create future for response
+        # Create future for response; the entry releases its slot as soon
+        # as the future settles (result, timeout/cancel)
         loop = asyncio.get_running_loop()
         future = loop.create_future()
-        self._responses[cmd_id] = future
+        self._track_response(cmd_id, future)
+        future.add_done_callback(lambda f, cid=cmd_id: self._release_response(cid, f))
         
         try:
             # Send message
             encoded = self.encode_message(message)
-            transport.write(encoded)
+            written = transport.write(encoded)
+            if asyncio.iscoroutine(written):  # FlipperTransport.write is async
+                await written
             
             # Wait for response
             response = await asyncio.wait_for(future, timeout)
@@ -153,15 +205,40 @@ class FlipperProtocol:
                 
             return response
             
-        finally:
-            self._responses.pop(cmd_id, None)
+        except BaseException:
+            # e.g. transport.write failed before the future was awaited
+            if not future.done():
+                future.cancel()
+            raise
             
+    def _track_response(self, cmd_id: int, future: asyncio.Future) -> None:
+        slot = cmd_id & _RESPONSE_MASK
+        held = self._responses[slot]
+        if held is not None and not held.done():
+            # 1024 commands still pending: don't evict the older one
+            self._overflow[cmd_id] = future
+            return
+        self._responses[slot] = future
+        self._response_ids[slot] = cmd_id
+
+    def _release_response(self, cmd_id: int, future: asyncio.Future) -> None:
+        slot = cmd_id & _RESPONSE_MASK
+        if self._responses[slot] is future:
+            self._responses[slot] = None
+        else:
+            self._overflow.pop(cmd_id, None)
+
+    def _pending_response(self, cmd_id: int) -> Optional[asyncio.Future]:
+        slot = cmd_id & _RESPONSE_MASK
+        if self._response_ids[slot] == cmd_id and self._responses[slot] is not None:
+            return self._responses[slot]
+        return self._overflow.get(cmd_id) if self._overflow else None
+
     def handle_response(self, message: RPCMessage):
         """Handle response message."""
-        if message.command_id in self._responses:
-            future = self._responses[message.command_id]
-            if not future.done():
-                future.set_result(message)
+        future = self._pending_response(message.command_id)
+        if future is not None and not future.done():
+            future.set_result(message)
                 
     def handle_event(self, message: RPCMessage):
         """Handle event message."""
@@ -173,14 +250,10 @@ class FlipperProtocol:
         
     def register_callback(self, event_type: str, callback):
         """Register callback for event type."""
-        if event_type not in self._callbacks:
-            self._callbacks[event_type] = []
-        self._callbacks[event_type].append(callback)
+        self._callbacks.setdefault(event_type, {})[callback] = None
         
     def unregister_callback(self, event_type: str, callback):
         """Unregister callback for event type."""
-        if event_type in self._callbacks:
-            self._callbacks[event_type] = [
-                cb for cb in self._callbacks[event_type]
-                if cb != callback
-            ]
\ No newline at end of file
+        callbacks = self._callbacks.get(event_type)
+        if callbacks is not None:
+            callbacks.pop(callback, None)
\ No newline at end of file
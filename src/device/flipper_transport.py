@@ -3,10 +3,16 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import json
 import logging
 import platform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Tuple
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
 
 try:  # Optional dependency
     import serial  # type: ignore
@@ -20,10 +26,22 @@ except Exception:  # pragma: no cover - runtime guard
     BleakClient = None  # type: ignore
     BleakScanner = None  # type: ignore
 
-from ..config.flipper_config import FLIPPER_USB_MODES, SERIAL_CONFIG
+from ..config.flipper_config import BLE_ADV_SERVICE_UUIDS, FLIPPER_USB_MODES, SERIAL_CONFIG
+from .ble_adapter import shared_scanner
 
 logger = logging.getLogger(__name__)
 
+# (vid, pid) -> mode name, so each enumerated port is a single dict probe
+_FLIPPER_VIDPID = {vidpid: mode for mode, vidpid in FLIPPER_USB_MODES.items()}
+_LINUX_TTY_PREFIXES = ("/dev/ttyACM", "/dev/ttyUSB")
+_SYSTEM = platform.system().lower()
+# Transport link states; the I/O hot paths only compare against these
+_DISCONNECTED = 0
+_CONNECTED = 1
+
+# SERIAL_CONFIG is fixed, so bind it once rather than unpacking per attempt
+_MAKE_SERIAL = functools.partial(serial.Serial, **SERIAL_CONFIG) if serial is not None else None
+
 
 @dataclass(frozen=True)
 class TransportStatus:
@@ -52,15 +70,47 @@ class FlipperTransport:
     async def read(self, size: int = -1, timeout: Optional[float] = None) -> bytes:  # pragma: no cover - interface
         raise NotImplementedError
 
+    async def flush(self) -> None:
+        """Wait until buffered writes have reached the device."""
+        return None
+
 
 class FlipperUSBTransport(FlipperTransport):
     """Serial transport. Requires pyserial."""
 
     name = "usb"
+    # Upper bound for one coalesced serial write
+    TX_BATCH_LIMIT = 4096
 
     def __init__(self) -> None:
         self.port: Optional[str] = None
         self._serial = None
+        # Bound methods of the open port, looked up once per connection
+        self._serial_write = None
+        self._serial_read = None
+        self._state = _DISCONNECTED
+        # pyserial is not thread-safe; one dedicated thread runs every
+        # blocking call so the event loop never waits on the port.
+        self._io_exec: Optional[ThreadPoolExecutor] = None
+        # Small frames queue here and a single pump writes them in batches
+        self._tx_queue: Optional[asyncio.Queue] = None
+        self._tx_task: Optional[asyncio.Task] = None
+        self._tx_error: Optional[BaseException] = None
+
+    async def _run_io(self, func, *args):
+        if self._io_exec is None:
+            self._io_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="flipper-usb")
+        return await asyncio.get_running_loop().run_in_executor(self._io_exec, func, *args)
+
+    def _attach_serial(self, port: Any) -> None:
+        self._serial = port
+        self._serial_write = port.write
+        self._serial_read = port.read
+        self._state = _CONNECTED
+
+    def _detach_serial(self) -> None:
+        self._state = _DISCONNECTED
+        self._serial = self._serial_write = self._serial_read = None
 
     @classmethod
     def availability(cls) -> TransportStatus:
@@ -73,15 +123,14 @@ class FlipperUSBTransport(FlipperTransport):
         if serial is None:
             return None
 
-        system = platform.system().lower()
+        linux = _SYSTEM == "linux"
         for port in serial.tools.list_ports.comports():  # type: ignore[attr-defined]
-            for _, (vid, pid) in FLIPPER_USB_MODES.items():
-                if port.vid == vid and port.pid == pid:
-                    if system == "linux":
-                        if port.device.startswith("/dev/ttyACM") or port.device.startswith("/dev/ttyUSB"):
-                            return port.device, (vid, pid)
-                    else:
-                        return port.device, (vid, pid)
+            vidpid = (port.vid, port.pid)
+            if vidpid not in _FLIPPER_VIDPID:
+                continue
+            if linux and not port.device.startswith(_LINUX_TTY_PREFIXES):
+                continue
+            return port.device, vidpid
         return None
 
     async def connect(self, **kwargs: Any) -> bool:
@@ -91,53 +140,141 @@ class FlipperUSBTransport(FlipperTransport):
 
         port = kwargs.get("port") or self.port
         if not port:
-            detected = self.find_flipper_port()
+            detected = await asyncio.to_thread(self.find_flipper_port)
             if not detected:
                 logger.error("No Flipper Zero device detected on USB")
                 return False
             port, _ = detected
 
+        opened = None
         try:
-            self._serial = serial.Serial(port=port, **SERIAL_CONFIG)  # type: ignore[attr-defined]
+            opened = await self._run_io(_MAKE_SERIAL, port)
+            await self._run_io(self._prepare_port, opened)
+            self._attach_serial(opened)
             self.port = port
-            await asyncio.sleep(0.05)
             return True
         except Exception as exc:  # serial.SerialException or others
             logger.error("USB connection failed: %s", exc)
-            if platform.system().lower() == "linux":
+            if _SYSTEM == "linux":
                 logger.info("Ensure the user is in the 'dialout' group or check udev rules.")
-            self._serial = None
+            if opened is not None and opened is not self._serial:
+                # Opened but never attached, so disconnect() would not close it
+                try:
+                    await self._run_io(opened.close)
+                except Exception as close_exc:
+                    logger.debug("Closing half-opened port failed: %s", close_exc)
+            self._detach_serial()
             return False
 
+    @staticmethod
+    def _prepare_port(port: Any) -> None:
+        # Discard bytes the CDC stack buffered before we opened the port;
+        # this replaces a blind settle delay after open.
+        port.reset_input_buffer()
+        set_low_latency = getattr(port, "set_low_latency_mode", None)
+        if set_low_latency is not None:
+            try:
+                # Stop the TTY layer from holding input for a scheduler tick
+                set_low_latency(True)
+            # cdc_acm may reject TIOCSSERIAL; pyserial raises
+            # NotImplementedError outside Linux
+            except (OSError, ValueError, NotImplementedError) as exc:
+                logger.debug("Low-latency mode unavailable: %s", exc)
+
     async def disconnect(self) -> bool:
         if not self._serial:
             return True
         try:
-            self._serial.close()
+            try:
+                await self.flush()
+            except Exception as exc:
+                logger.debug("Dropping unsent USB data: %s", exc)
+            self._stop_tx_pump()
+            await self._run_io(self._serial.close)
             return True
         except Exception as exc:  # serial.SerialException
             logger.error("USB disconnect failed: %s", exc)
             return False
         finally:
-            self._serial = None
+            self._detach_serial()
+            if self._io_exec is not None:
+                self._io_exec.shutdown(wait=False)
+                self._io_exec = None
 
     async def write(self, data: bytes) -> int:
-        if not self._serial or not self._serial.is_open:
+        if self._state != _CONNECTED:
             raise ConnectionError("USB transport not connected")
-        return self._serial.write(data)
+        self._raise_tx_error()
+        if self._tx_task is None or self._tx_task.done():
+            self._tx_queue = asyncio.Queue()
+            self._tx_task = asyncio.get_running_loop().create_task(self._tx_pump())
+        # Views may point into caller buffers that change after we return
+        self._tx_queue.put_nowait(data if isinstance(data, bytes) else bytes(data))
+        return len(data)
+
+    async def flush(self) -> None:
+        if self._tx_queue is not None and self._tx_task is not None and not self._tx_task.done():
+            await self._tx_queue.join()
+        self._raise_tx_error()
+
+    def _raise_tx_error(self) -> None:
+        if self._tx_error is not None:
+            error, self._tx_error = self._tx_error, None
+            raise ConnectionError(f"USB write failed: {error}") from error
+
+    def _stop_tx_pump(self) -> None:
+        if self._tx_task is not None:
+            self._tx_task.cancel()
+        self._tx_task = None
+        self._tx_queue = None
+
+    async def _tx_pump(self) -> None:
+        queue = self._tx_queue
+        assert queue is not None
+        while True:
+            batch = bytearray(await queue.get())
+            taken = 1
+            # Drain whatever else is already queued into the same write
+            while len(batch) < self.TX_BATCH_LIMIT and not queue.empty():
+                batch += queue.get_nowait()
+                taken += 1
+            try:
+                write = self._serial_write
+                if self._tx_error is None and write is not None:
+                    await self._run_io(write, bytes(batch))
+            except Exception as exc:  # serial.SerialException or others
+                logger.error("USB write failed: %s", exc)
+                self._tx_error = exc
+                if isinstance(exc, OSError):  # SerialException: port is gone
+                    self._state = _DISCONNECTED
+            finally:
+                for _ in range(taken):
+                    queue.task_done()
 
     async def read(self, size: int = -1, timeout: Optional[float] = None) -> bytes:
-        if not self._serial or not self._serial.is_open:
+        if self._state != _CONNECTED:
             raise ConnectionError("USB transport not connected")
 
-        original_timeout = self._serial.timeout
+        # A reply can only arrive after the request actually went out
+        await self.flush()
         try:
-            if timeout is not None:
-                self._serial.timeout = timeout
-            return self._serial.read(size)
+            if timeout is None:
+                return await self._run_io(self._serial_read, size)
+            return await self._run_io(self._read_blocking, self._serial, self._serial_read, size, timeout)
+        except OSError as exc:  # serial.SerialException: port is gone
+            self._state = _DISCONNECTED
+            raise ConnectionError(f"USB read failed: {exc}") from exc
+
+    @staticmethod
+    def _read_blocking(port, read, size: int, timeout: float) -> bytes:
+        # Runs on the I/O thread, so the temporary timeout cannot leak into
+        # a concurrent read or write.
+        original_timeout = port.timeout
+        try:
+            port.timeout = timeout
+            return read(size)
         finally:
-            if timeout is not None:
-                self._serial.timeout = original_timeout
+            port.timeout = original_timeout
 
 
 class FlipperBLETransport(FlipperTransport):
@@ -147,13 +284,39 @@ class FlipperBLETransport(FlipperTransport):
     SERVICE_UUID = "8fe5b3d5-2e7f-4a98-2a48-7acc60fe0000"
     RX_CHAR_UUID = "8fe5b3d5-2e7f-4a98-2a48-7acc60fe0002"
     TX_CHAR_UUID = "8fe5b3d5-2e7f-4a98-2a48-7acc60fe0003"
+    GATT_CACHE_FILE = Path.home() / ".hydra" / "gatt_cache.json"
+    # ATT default; replaced by the negotiated value after connect
+    DEFAULT_MTU = 23
+    # Longest value a write-with-response may carry
+    MAX_ACKED_WRITE = 512
+
+    # address -> (rx_uuid, tx_uuid), shared by every transport instance
+    _gatt_cache: Dict[str, Tuple[str, str]] = {}
+    _gatt_cache_loaded = False
+
+    # A Flipper seen this recently is connected to without scanning again
+    SIGHTING_TTL = 10.0
+    # Discovery returns at the first match; this only bounds the miss case
+    SCAN_TIMEOUT = 3.0
+    # address -> (name, monotonic time last seen)
+    _sightings: Dict[str, Tuple[str, float]] = {}
 
     def __init__(self) -> None:
         self.address: Optional[str] = None
         self._client = None
-        self._notification_queue: asyncio.Queue[bytes] = asyncio.Queue()
+        # Notifications are appended here; read() slices bytes off the front
+        self._rx_buf = bytearray()
+        self._rx_ready = asyncio.Event()
+        # Loop (and its thread) that owns _rx_buf; set on connect
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
         self._rx_char_uuid: Optional[str] = None
         self._tx_char_uuid: Optional[str] = None
+        self.mtu_size = self.DEFAULT_MTU
+        # Chosen per connection from the TX characteristic's properties
+        self._tx_response = True
+        self._tx_chunk = self.MAX_ACKED_WRITE
+        self._state = _DISCONNECTED
 
     @classmethod
     def availability(cls) -> TransportStatus:
@@ -161,21 +324,143 @@ class FlipperBLETransport(FlipperTransport):
             return TransportStatus(False, "bleak not installed")
         return TransportStatus(True)
 
-    @staticmethod
-    async def find_flipper_device() -> Optional[str]:
+    @classmethod
+    def _recent_flipper(cls) -> Optional[str]:
+        cutoff = time.monotonic() - cls.SIGHTING_TTL
+        recent = [(seen, address) for address, (_, seen) in cls._sightings.items() if seen >= cutoff]
+        return max(recent)[1] if recent else None
+
+    @classmethod
+    async def find_flipper_device(cls, timeout: Optional[float] = None) -> Optional[str]:
         if BleakScanner is None:
             return None
+        if timeout is None:
+            timeout = cls.SCAN_TIMEOUT
+        address = cls._recent_flipper()
+        if address:
+            return address
+
+        found = asyncio.Event()
+
+        def _on_detect(device: Any, adv: Any) -> None:
+            # The OS drops non-Flipper advertisements; the name check stays
+            # as a sanity check for backends that ignore the filter.
+            name = getattr(adv, "local_name", None) or device.name
+            if name and "Flipper" in name:
+                cls._sightings[device.address] = (name, time.monotonic())
+                found.set()
+
         try:
-            devices = await BleakScanner.discover()
-            for device in devices:
-                if device.name and "Flipper" in device.name:
-                    return device.address
+            # Concurrent lookups get the same scanner for this filter set and
+            # share one OS scan
+            scanner = shared_scanner(BleakScanner, tuple(BLE_ADV_SERVICE_UUIDS), "active")
+            async with scanner.listen(_on_detect):
+                try:
+                    await asyncio.wait_for(found.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
         except Exception as exc:
             logger.error("BLE scan failed: %s", exc)
-        return None
+        return cls._recent_flipper()
+
+    @classmethod
+    def _cached_characteristics(cls, address: str) -> Optional[Tuple[str, str]]:
+        if not cls._gatt_cache_loaded:
+            cls._gatt_cache_loaded = True
+            try:
+                with open(cls.GATT_CACHE_FILE, "r", encoding="utf-8") as fh:
+                    stored = json.load(fh)
+                cls._gatt_cache.update(
+                    (addr, (rx, tx)) for addr, (rx, tx) in stored.items()
+                )
+            except (OSError, ValueError, TypeError, AttributeError):
+                pass
+        return cls._gatt_cache.get(address)
+
+    @classmethod
+    def _remember_characteristics(cls, address: str, rx_uuid: str, tx_uuid: str) -> None:
+        if cls._gatt_cache.get(address) == (rx_uuid, tx_uuid):
+            return
+        cls._gatt_cache[address] = (rx_uuid, tx_uuid)
+        try:
+            cls.GATT_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(cls.GATT_CACHE_FILE, "w", encoding="utf-8") as fh:
+                json.dump(cls._gatt_cache, fh)
+        except OSError as exc:
+            logger.debug("Could not persist GATT cache: %s", exc)
+
+    @classmethod
+    def _forget_characteristics(cls, address: str) -> None:
+        cls._gatt_cache.pop(address, None)
+
+    def _discover_characteristics(self, client: Any) -> None:
+        # bleak indexes characteristics on the service collection; only
+        # walk every service when that lookup is missing or inconclusive.
+        get_characteristic = getattr(client.services, "get_characteristic", None)
+        if get_characteristic is not None:
+            try:
+                rx = get_characteristic(self.RX_CHAR_UUID)
+                tx = get_characteristic(self.TX_CHAR_UUID)
+            except Exception:  # e.g. BleakError for duplicate UUIDs
+                rx = tx = None
+            if rx is not None and tx is not None:
+                self._rx_char_uuid = rx.uuid
+                self._tx_char_uuid = tx.uuid
+                return
+
+        target_rx = self.RX_CHAR_UUID.lower()
+        target_tx = self.TX_CHAR_UUID.lower()
+
+        for service in client.services:
+            for characteristic in service.characteristics:
+                uuid = characteristic.uuid.lower()
+                if uuid == target_rx:
+                    self._rx_char_uuid = characteristic.uuid
+                elif uuid == target_tx:
+                    self._tx_char_uuid = characteristic.uuid
+
+    async def _negotiate_mtu(self, client: Any) -> None:
+        # WinRT and CoreBluetooth exchange the MTU during connect. BlueZ
+        # reports 23 until a characteristic is acquired, which is what
+        # bleak's private _acquire_mtu does.
+        try:
+            acquire = getattr(getattr(client, "_backend", None), "_acquire_mtu", None)
+            if acquire is not None:
+                await acquire()
+            self.mtu_size = int(client.mtu_size)
+        except Exception as exc:
+            logger.debug("MTU negotiation unavailable, keeping %d: %s", self.mtu_size, exc)
+
+    def _prepare_tx(self, client: Any) -> None:
+        # Unacknowledged writes skip a connection-event round trip per
+        # packet; use them whenever the Flipper advertises support.
+        try:
+            characteristic = client.services.get_characteristic(self._tx_char_uuid)
+        except Exception:
+            characteristic = None
+        properties = getattr(characteristic, "properties", None) or ()
+        self._tx_response = "write-without-response" not in properties
+        if self._tx_response:
+            self._tx_chunk = self.MAX_ACKED_WRITE
+            return
+        size = getattr(characteristic, "max_write_without_response_size", None)
+        self._tx_chunk = size if isinstance(size, int) and size > 0 else self.mtu_size - 3
+
+    def _on_disconnected(self, _client: Any) -> None:
+        # Called by bleak when the link drops, including remote disconnects
+        self._state = _DISCONNECTED
 
     def _notification_handler(self, _: str, data: bytearray) -> None:
-        self._notification_queue.put_nowait(bytes(data))
+        if self._loop is None or threading.get_ident() == self._loop_thread:
+            self._on_notification(data)
+        else:
+            # Some backends call back from a worker thread; hand the bytes
+            # (the backend may reuse its buffer) over to the loop.
+            self._loop.call_soon_threadsafe(self._on_notification, bytes(data))
+
+    def _on_notification(self, data: Union[bytes, bytearray]) -> None:
+        self._rx_buf += data
+        self._rx_ready.set()
 
     async def connect(self, **kwargs: Any) -> bool:
         if BleakClient is None:
@@ -184,30 +469,38 @@ class FlipperBLETransport(FlipperTransport):
 
         address = kwargs.get("address") or self.address
         if not address:
-            address = await self.find_flipper_device()
+            address = await self.find_flipper_device(kwargs.get("scan_timeout"))
             if not address:
                 logger.error("No Flipper Zero detected via BLE")
                 return False
 
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
         try:
-            client = BleakClient(address)
+            client = BleakClient(address, disconnected_callback=self._on_disconnected)
             await client.connect()
             self.address = address
             self._client = client
+            await self._negotiate_mtu(client)
+
+            cached = self._cached_characteristics(address)
+            if cached is not None:
+                # Skip the service walk for a device we have seen before
+                self._rx_char_uuid, self._tx_char_uuid = cached
+                try:
+                    await client.start_notify(self._rx_char_uuid, self._notification_handler)
+                    self._prepare_tx(client)
+                    self._state = _CONNECTED
+                    return True
+                except Exception as exc:
+                    logger.debug("Cached GATT layout for %s is stale: %s", address, exc)
+                    self._forget_characteristics(address)
+                    self._rx_char_uuid = self._tx_char_uuid = None
 
             if client.services is None:
                 await client.get_services()
 
-            target_rx = self.RX_CHAR_UUID.lower()
-            target_tx = self.TX_CHAR_UUID.lower()
-
-            for service in client.services:
-                for characteristic in service.characteristics:
-                    uuid = characteristic.uuid.lower()
-                    if uuid == target_rx:
-                        self._rx_char_uuid = characteristic.uuid
-                    elif uuid == target_tx:
-                        self._tx_char_uuid = characteristic.uuid
+            self._discover_characteristics(client)
 
             if not self._rx_char_uuid or not self._tx_char_uuid:
                 logger.error("Required BLE characteristics not found on device")
@@ -216,6 +509,9 @@ class FlipperBLETransport(FlipperTransport):
                 return False
 
             await client.start_notify(self._rx_char_uuid, self._notification_handler)
+            self._prepare_tx(client)
+            self._remember_characteristics(address, self._rx_char_uuid, self._tx_char_uuid)
+            self._state = _CONNECTED
             return True
         except Exception as exc:
             logger.error("BLE connection failed: %s", exc)
@@ -232,19 +528,41 @@ class FlipperBLETransport(FlipperTransport):
             logger.error("BLE disconnect failed: %s", exc)
             return False
         finally:
+            self._state = _DISCONNECTED
             self._client = None
+            self.mtu_size = self.DEFAULT_MTU
+            self._rx_buf.clear()
+            self._rx_ready.clear()
 
     async def write(self, data: bytes) -> int:
-        if not self._client or not self._client.is_connected:
+        if self._state != _CONNECTED:
             raise ConnectionError("BLE transport not connected")
-        assert self._tx_char_uuid
-        await self._client.write_gatt_char(self._tx_char_uuid, data)
+        view = memoryview(data)
+        chunk = self._tx_chunk
+        write = self._client.write_gatt_char
+        uuid = self._tx_char_uuid
+        response = self._tx_response
+        # Slices go out strictly in order: backends may complete concurrent
+        # writes out of order, and an unacked write returns as soon as the
+        # stack has queued the packet, so awaiting each one costs little
+        for start in range(0, len(view), chunk):
+            await write(uuid, view[start:start + chunk], response=response)
         return len(data)
 
     async def read(self, size: int = -1, timeout: Optional[float] = None) -> bytes:
-        if not self._client or not self._client.is_connected:
+        if self._state != _CONNECTED:
             raise ConnectionError("BLE transport not connected")
-        try:
-            return await asyncio.wait_for(self._notification_queue.get(), timeout)
-        except asyncio.TimeoutError:
-            return b""
+        if not self._rx_buf:
+            try:
+                await asyncio.wait_for(self._rx_ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return b""
+        if size < 0 or size >= len(self._rx_buf):
+            data = bytes(self._rx_buf)
+            self._rx_buf.clear()
+        else:
+            data = bytes(self._rx_buf[:size])
+            del self._rx_buf[:size]
+        if not self._rx_buf:
+            self._rx_ready.clear()
+        return data
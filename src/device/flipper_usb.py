@@ -2,13 +2,16 @@
 
 Provides the synchronous API that existing tooling expects by internally
 leveraging the new asynchronous ``FlipperUSBTransport`` implementation.
+All calls run on one background event loop, so the transport's port,
+I/O thread and write queue persist between calls.
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
-from typing import List, Optional
+import threading
+from typing import Any, Coroutine, List, Optional
 
 from .flipper_transport import FlipperUSBTransport
 
@@ -18,8 +21,33 @@ logger = logging.getLogger(__name__)
 class FlipperUSB:
     """Synchronous facade around :class:`FlipperUSBTransport`."""
 
+    # Upper bound for calls that carry no timeout of their own
+    CALL_TIMEOUT = 10.0
+
     def __init__(self) -> None:
         self._transport = FlipperUSBTransport()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="flipper-usb-loop", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, coro: Coroutine[Any, Any, Any], timeout: Optional[float] = CALL_TIMEOUT) -> Any:
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()  # don't leave a timed-out call running on the loop
+            raise
+
+    def close(self) -> None:
+        """Disconnect and stop the background loop."""
+        if self._loop.is_closed():
+            return
+        self.disconnect()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=1.0)
+        self._loop.close()
 
     @staticmethod
     def find_flipper_ports() -> List[str]:
@@ -33,7 +61,7 @@ class FlipperUSB:
     def connect(self, port: Optional[str] = None) -> bool:
         """Connect to the Flipper Zero over USB."""
         try:
-            return asyncio.run(self._transport.connect(port=port))
+            return self._run(self._transport.connect(port=port))
         except Exception as exc:  # pragma: no cover - defensive log
             logger.error("Legacy USB connect failed: %s", exc)
             return False
@@ -41,7 +69,7 @@ class FlipperUSB:
     def disconnect(self) -> bool:
         """Disconnect from the Flipper Zero device."""
         try:
-            return asyncio.run(self._transport.disconnect())
+            return self._run(self._transport.disconnect())
         except Exception as exc:  # pragma: no cover - defensive log
             logger.error("Legacy USB disconnect failed: %s", exc)
             return False
@@ -49,16 +77,23 @@ class FlipperUSB:
     def send_command(self, data: bytes) -> bool:
         """Send raw bytes to the device."""
         try:
-            written = asyncio.run(self._transport.write(data))
-            return written == len(data)
+            return self._run(self._send(data))
         except Exception as exc:  # pragma: no cover - defensive log
             logger.error("Legacy USB send failed: %s", exc)
             return False
 
+    async def _send(self, data: bytes) -> bool:
+        written = await self._transport.write(data)
+        # Writes are batched by the transport; report once they are sent
+        await self._transport.flush()
+        return written == len(data)
+
     def read_response(self, size: int = -1, timeout: float | None = 1.0) -> bytes:
         """Read bytes from the device."""
         try:
-            return asyncio.run(self._transport.read(size=size, timeout=timeout))
+            # Allow the read its own timeout plus headroom for the handoff
+            wait = None if timeout is None else timeout + self.CALL_TIMEOUT
+            return self._run(self._transport.read(size=size, timeout=timeout), wait)
         except Exception as exc:  # pragma: no cover - defensive log
             logger.error("Legacy USB read failed: %s", exc)
             return b""
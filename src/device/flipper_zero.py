@@ -5,13 +5,19 @@ Implements official protocols and community best practices.
 """
 
 import asyncio
+import base64
 import logging
 from enum import Enum
 from typing import Optional, Dict, Any, List, Union
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
+try:  # Optional C JSON codec; falls back to the stdlib
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 from .flipper_protocol import FlipperProtocol, RPCMessage, MessageType, FlipperProtocolError
 from .flipper_transport import FlipperUSBTransport, FlipperBLETransport
 from ..config.flipper_config import (
@@ -21,6 +27,9 @@ from ..config.flipper_config import (
 
 logger = logging.getLogger(__name__)
 
+# Payload encoding written by save_signal; files without the field are hex
+_SIGNAL_ENCODING = "base64"
+
 class FlipperMode(Enum):
     """Flipper Zero operating modes."""
     SUB_GHZ = "subghz"
@@ -30,7 +39,7 @@ class FlipperMode(Enum):
     GPIO = "gpio"
     IBUTTON = "ibutton"
 
-@dataclass
+@dataclass(slots=True)
 class FlipperSignal:
     """Container for captured signal data."""
     mode: FlipperMode
@@ -38,7 +47,12 @@ class FlipperSignal:
     modulation: Optional[str] = None   # For Sub-GHz
     protocol: Optional[str] = None     # For various modes
     data: bytes = b""
-    metadata: Dict[str, Any] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    
+    @property
+    def view(self) -> memoryview:
+        """Zero-copy view of ``data`` for slicing into transmit chunks."""
+        return memoryview(self.data)
 
 class FlipperZeroDevice:
     """Interface for communicating with Flipper Zero.
@@ -51,6 +65,10 @@ class FlipperZeroDevice:
         """Initialize Flipper Zero interface."""
         self.connected = False
         self.current_mode: Optional[FlipperMode] = None
+        # One instance per link, reused across reconnects so a port or BLE
+        # client is always closed by the object that opened it
+        self._transport_usb = FlipperUSBTransport()
+        self._transport_ble = FlipperBLETransport()
         self._transport = None
         self._protocol = FlipperProtocol()
         self.device_info = {}
@@ -68,12 +86,7 @@ class FlipperZeroDevice:
             bool: True if connection successful
         """
         try:
-            self._transport = FlipperUSBTransport(port)
-            if await self._transport.connect():
-                self.connected = True
-                await self._init_device()
-                return True
-            return False
+            return await self._connect_transport(self._transport_usb, port=port)
         except Exception as e:
             logger.error(f"Failed to connect via USB: {e}")
             return False
@@ -88,16 +101,27 @@ class FlipperZeroDevice:
             bool: True if connection successful
         """
         try:
-            self._transport = FlipperBLETransport(address)
-            if await self._transport.connect():
-                self.connected = True
-                await self._init_device()
-                return True
-            return False
+            return await self._connect_transport(self._transport_ble, address=address)
         except Exception as e:
             logger.error(f"Failed to connect via BLE: {e}")
             return False
             
+    async def _connect_transport(self, transport, **kwargs) -> bool:
+        """Open ``transport`` (closing any active link first) and initialise."""
+        if self._transport is not None:
+            # Also when reusing the same transport, or it would reopen a live port
+            await self.disconnect()
+        if not await transport.connect(**kwargs):
+            return False
+        self._transport = transport
+        self.connected = True
+        try:
+            await self._init_device()
+        except Exception:
+            await self.disconnect()
+            raise
+        return True
+            
     async def _init_device(self):
         """Initialize device after connection."""
         try:
@@ -134,13 +158,14 @@ class FlipperZeroDevice:
             
         try:
             if self._transport:
-                # Cleanup transport
-                self._transport = None
-            self.connected = False
+                return await self._transport.disconnect()
             return True
         except Exception as e:
             logger.error(f"Error disconnecting: {e}")
             return False
+        finally:
+            self._transport = None
+            self.connected = False
             
     async def set_mode(self, mode: FlipperMode) -> bool:
         """Switch Flipper Zero to specified mode."""
@@ -293,27 +318,50 @@ class FlipperZeroDevice:
                 "frequency": signal.frequency,
                 "modulation": signal.modulation,
                 "protocol": signal.protocol,
-                "data": signal.data.hex(),
-                "metadata": signal.metadata or {}
+                "encoding": _SIGNAL_ENCODING,
+                "data": base64.b64encode(signal.data).decode('ascii'),
+                "metadata": signal.metadata
             }
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2)
+            if orjson is not None:
+                with open(filepath, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(filepath, 'w') as f:
+                    json.dump(data, f, indent=2)
             return True
         except Exception as e:
             logger.error(f"Failed to save signal: {e}")
             return False
             
+    @staticmethod
+    def _decode_signal_record(record: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn the top-level record's payload into bytes.
+        
+        Records written before the base64 format have no "encoding" and
+        hold hex. Nested metadata is left untouched.
+        """
+        if record.get("encoding") == _SIGNAL_ENCODING:
+            record["data"] = base64.b64decode(record["data"])
+        else:
+            record["data"] = bytes.fromhex(record["data"])
+        return record
+        
     def load_signal(self, filepath: str) -> Optional[FlipperSignal]:
         """Load signal from file."""
         try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
+            if orjson is not None:
+                with open(filepath, 'rb') as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(filepath, 'r') as f:
+                    data = json.load(f)
+            data = self._decode_signal_record(data)
             return FlipperSignal(
                 mode=FlipperMode(data["mode"]),
                 frequency=data.get("frequency"),
                 modulation=data.get("modulation"),
                 protocol=data.get("protocol"),
-                data=bytes.fromhex(data["data"]),
+                data=data["data"],
                 metadata=data.get("metadata", {})
             )
         except Exception as e:
@@ -16,6 +16,8 @@ class MockTransport(FlipperTransport):
     def __init__(self) -> None:
         self._connected = False
         self._buffer = bytearray()
+        # Read cursor into _buffer; consumed bytes are dropped in bulk
+        self._rd_pos = 0
 
     @classmethod
     def availability(cls) -> TransportStatus:
@@ -30,6 +32,7 @@ class MockTransport(FlipperTransport):
         await asyncio.sleep(0.01)
         self._connected = False
         self._buffer.clear()
+        self._rd_pos = 0
         return True
 
     async def write(self, data: bytes) -> int:
@@ -42,11 +45,15 @@ class MockTransport(FlipperTransport):
         if not self._connected:
             raise ConnectionError("Mock transport not connected")
         await asyncio.sleep(0.05)
-        if not self._buffer:
+        start = self._rd_pos
+        if start >= len(self._buffer):
             return b"OK"
-        data = bytes(self._buffer[:size if size > 0 else None])
-        if size > 0:
-            del self._buffer[:size]
-        else:
-            self._buffer.clear()
+        end = start + size if size > 0 else len(self._buffer)
+        data = bytes(self._buffer[start:end])
+        self._rd_pos = min(end, len(self._buffer))
+        # Compact once at least half the buffer is consumed, so each byte
+        # is shifted O(1) times instead of on every small read
+        if self._rd_pos * 2 >= len(self._buffer):
+            del self._buffer[:self._rd_pos]
+            self._rd_pos = 0
         return data
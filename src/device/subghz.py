@@ -7,13 +7,47 @@ import numpy as np
 from dataclasses import dataclass
 from typing import List, Dict, Optional, Tuple, Any
 from enum import Enum
+from functools import lru_cache
 import logging
+import math
 import struct
 import json
 from pathlib import Path
 
+try:  # Optional C JSON codec for signal metadata; falls back to the stdlib
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:  # Optional JIT for the fused sample-statistics loop
+    from numba import njit
+except ImportError:  # pragma: no cover - optional dependency
+    njit = None
+
 logger = logging.getLogger(__name__)
 
+# Storage dtype for captured samples: interleaved float32 I/Q
+_SAMPLE_DTYPE = np.complex64
+
+# .npz archives are zip files
+_NPZ_MAGIC = b"PK\x03\x04"
+
+# Longest pulse (in samples) detect_bit_rate will histogram with bincount
+_BINCOUNT_MAX_LENGTH = 1 << 16
+
+if orjson is not None:
+    def _dumps(obj: Any) -> bytes:
+        # Metadata may hold numpy scalars such as the estimated bit rate
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    _loads = orjson.loads
+else:
+    def _dumps(obj: Any) -> bytes:
+        # Same numpy scalar support as the orjson path
+        return json.dumps(obj, default=lambda o: o.item()).encode('utf-8')
+
+    _loads = json.loads
+
 class ModulationType(Enum):
     """Supported modulation types."""
     AM = "AM"  # Amplitude Modulation
@@ -31,11 +65,20 @@ class DecodingType(Enum):
     PWM = "pwm"
     RAW = "raw"
 
-@dataclass
+# Resolved once so hot paths compare by identity instead of attribute lookups
+_MOD_AM = ModulationType.AM
+_MOD_FM = ModulationType.FM
+_MOD_ASK = ModulationType.ASK
+_MOD_FSK = ModulationType.FSK
+_MOD_OOK = ModulationType.OOK
+_MOD_PSK = ModulationType.PSK
+_MODULATION_BY_VALUE = {m.value: m for m in ModulationType}
+
+@dataclass(slots=True, frozen=True)
 class SubGHzProtocolInfo:
     """Protocol definition and parameters."""
     name: str
-    frequencies: List[float]
+    frequencies: Tuple[float, ...]
     modulation: ModulationType
     bit_rate: float
     deviation: Optional[float] = None  # For FSK
@@ -44,6 +87,10 @@ class SubGHzProtocolInfo:
     min_repeats: int = 1
     gap_limit: Optional[int] = None
     
+    def __post_init__(self):
+        # Keep instances hashable when given a list
+        object.__setattr__(self, 'frequencies', tuple(self.frequencies))
+    
 class SubGHzProtocolRegistry:
     """Registry of known Sub-GHz protocols."""
     
@@ -51,7 +98,7 @@ class SubGHzProtocolRegistry:
     PROTOCOLS = {
         "princeton": SubGHzProtocolInfo(
             name="Princeton",
-            frequencies=[433.92],
+            frequencies=(433.92,),
             modulation=ModulationType.ASK,
             bit_rate=2000,
             decode_type=DecodingType.MANCHESTER,
@@ -59,7 +106,7 @@ class SubGHzProtocolRegistry:
         ),
         "keeloq": SubGHzProtocolInfo(
             name="KeeLoq",
-            frequencies=[433.92, 434.42, 868.35],
+            frequencies=(433.92, 434.42, 868.35),
             modulation=ModulationType.FSK,
             bit_rate=1500,
             deviation=50000,
@@ -68,7 +115,7 @@ class SubGHzProtocolRegistry:
         ),
         "nice_flor_s": SubGHzProtocolInfo(
             name="Nice FLO",
-            frequencies=[433.92],
+            frequencies=(433.92,),
             modulation=ModulationType.AM,
             bit_rate=1000,
             decode_type=DecodingType.MANCHESTER,
@@ -76,7 +123,7 @@ class SubGHzProtocolRegistry:
         ),
         "chamberlain": SubGHzProtocolInfo(
             name="Chamberlain",
-            frequencies=[300.0, 390.0],
+            frequencies=(300.0, 390.0),
             modulation=ModulationType.OOK,
             bit_rate=2000,
             decode_type=DecodingType.BINARY,
@@ -86,22 +133,139 @@ class SubGHzProtocolRegistry:
         # Add more protocols as needed
     }
     
+    # Sorted frequencies with the PROTOCOLS position of their owner, built
+    # on first lookup and dropped by register_protocol
+    _freq_index: Optional[Tuple[np.ndarray, np.ndarray, List[SubGHzProtocolInfo]]] = None
+    
     @classmethod
     def get_protocol(cls, name: str) -> Optional[SubGHzProtocolInfo]:
         """Get protocol by name."""
+        return cls._lookup_protocol(name)
+        
+    @classmethod
+    @lru_cache(maxsize=128)
+    def _lookup_protocol(cls, name: str) -> Optional[SubGHzProtocolInfo]:
+        # Cached per spelling; register_protocol clears it
         return cls.PROTOCOLS.get(name.lower())
         
+    @classmethod
+    def register_protocol(cls, key: str, protocol: SubGHzProtocolInfo):
+        """Add or replace a protocol definition."""
+        cls.PROTOCOLS[key.lower()] = protocol
+        cls._freq_index = None
+        cls._lookup_protocol.cache_clear()
+        
+    @classmethod
+    def _frequency_index(cls) -> Tuple[np.ndarray, np.ndarray, List[SubGHzProtocolInfo]]:
+        if cls._freq_index is None:
+            protocols = list(cls.PROTOCOLS.values())
+            freqs = [f for p in protocols for f in p.frequencies]
+            owners = [i for i, p in enumerate(protocols) for _ in p.frequencies]
+            order = np.argsort(freqs, kind='stable')
+            cls._freq_index = (
+                np.asarray(freqs, dtype=np.float64)[order],
+                np.asarray(owners, dtype=np.intp)[order],
+                protocols,
+            )
+        return cls._freq_index
+        
     @classmethod
     def get_protocols_for_frequency(cls, freq: float, 
                                   tolerance: float = 0.1) -> List[SubGHzProtocolInfo]:
         """Get protocols that operate on given frequency."""
-        matching = []
-        for protocol in cls.PROTOCOLS.values():
-            for protocol_freq in protocol.frequencies:
-                if abs(protocol_freq - freq) <= tolerance:
-                    matching.append(protocol)
-                    break
-        return matching
+        freqs, owners, protocols = cls._frequency_index()
+        
+        # Binary search the window, padded by one so rounding in
+        # freq +/- tolerance can't drop an edge match
+        lo = max(int(np.searchsorted(freqs, freq - tolerance)) - 1, 0)
+        hi = int(np.searchsorted(freqs, freq + tolerance, side='right')) + 1
+        hits = owners[lo:hi][np.abs(freqs[lo:hi] - freq) <= tolerance]
+        
+        # np.unique sorts, which restores PROTOCOLS order
+        return [protocols[i] for i in np.unique(hits)]
+
+def _modulation_stats_loop(re: np.ndarray, im: np.ndarray) -> Tuple[float, float, float]:
+    """Variances of |s|, angle(s[i] * conj(s[i-1])) and angle(s) in one pass.
+    
+    Plain Python this is slow; it is only called once compiled by numba.
+    """
+    n = re.shape[0]
+    a_sum = a_sq = f_sum = f_sq = p_sum = p_sq = 0.0
+    for i in range(n):
+        r = re[i]
+        m = im[i]
+        a = math.sqrt(r * r + m * m)
+        a_sum += a
+        a_sq += a * a
+        p = math.atan2(m, r)
+        p_sum += p
+        p_sq += p * p
+        if i > 0:
+            pr = re[i - 1]
+            pm = im[i - 1]
+            f = math.atan2(m * pr - r * pm, r * pr + m * pm)
+            f_sum += f
+            f_sq += f * f
+    if n == 0:
+        return math.nan, math.nan, math.nan
+    a_mean = a_sum / n
+    p_mean = p_sum / n
+    f_var = math.nan
+    if n > 1:
+        f_mean = f_sum / (n - 1)
+        f_var = f_sq / (n - 1) - f_mean * f_mean
+    return a_sq / n - a_mean * a_mean, f_var, p_sq / n - p_mean * p_mean
+
+
+def _modulation_stats_numpy(samples: np.ndarray) -> Tuple[float, float, float]:
+    amplitude_var = np.var(np.abs(samples))
+    frequency_var = np.var(np.angle(samples[1:] * np.conj(samples[:-1])))
+    phase_var = np.var(np.angle(samples))
+    return amplitude_var, frequency_var, phase_var
+
+
+if njit is not None:
+    _modulation_stats_kernel = njit(fastmath=True, cache=True)(_modulation_stats_loop)
+    
+    def _modulation_stats(samples: np.ndarray) -> Tuple[float, float, float]:
+        if len(samples) < 2:  # numpy's nan/warning semantics for tiny inputs
+            return _modulation_stats_numpy(samples)
+        samples = np.asarray(samples)
+        return _modulation_stats_kernel(samples.real, samples.imag)
+else:
+    _modulation_stats = _modulation_stats_numpy
+
+
+def _above_threshold_loop(re: np.ndarray, im: np.ndarray, limit_sq: float) -> np.ndarray:
+    """|s| > threshold as re² + im² > threshold², without a sqrt or temporaries.
+    
+    Only worth it compiled: numpy's complex abs is already a vectorised
+    hypot and beats squaring the strided .real/.imag views.
+    """
+    n = re.shape[0]
+    out = np.empty(n, dtype=np.bool_)
+    for i in range(n):
+        r = re[i]
+        m = im[i]
+        out[i] = r * r + m * m > limit_sq
+    return out
+
+
+def _above_threshold_numpy(samples: np.ndarray, threshold: float) -> np.ndarray:
+    return np.abs(samples) > threshold
+
+
+if njit is not None:
+    _above_threshold_kernel = njit(cache=True)(_above_threshold_loop)
+    
+    def _above_threshold(samples: np.ndarray, threshold: float) -> np.ndarray:
+        samples = np.asarray(samples)
+        if not np.iscomplexobj(samples):
+            return _above_threshold_numpy(samples, threshold)
+        return _above_threshold_kernel(samples.real, samples.imag, threshold * threshold)
+else:
+    _above_threshold = _above_threshold_numpy
+
 
 class SignalAnalyzer:
     """Sub-GHz signal analysis tools."""
@@ -110,157 +274,201 @@ class SignalAnalyzer:
     def detect_modulation(samples: np.ndarray) -> ModulationType:
         """Detect modulation type from raw samples."""
         # Calculate signal properties
-        amplitude_var = np.var(np.abs(samples))
-        frequency_var = np.var(np.angle(samples[1:] * np.conj(samples[:-1])))
-        phase_var = np.var(np.angle(samples))
+        amplitude_var, frequency_var, phase_var = _modulation_stats(samples)
         
         # Simple heuristic classification
         if amplitude_var > 0.5:  # High amplitude variation
-            return ModulationType.AM if amplitude_var > 0.8 else ModulationType.ASK
+            return _MOD_AM if amplitude_var > 0.8 else _MOD_ASK
         elif frequency_var > 0.5:  # High frequency variation
-            return ModulationType.FM if frequency_var > 0.8 else ModulationType.FSK
+            return _MOD_FM if frequency_var > 0.8 else _MOD_FSK
         elif phase_var > 0.5:  # High phase variation
-            return ModulationType.PSK
+            return _MOD_PSK
         else:
-            return ModulationType.OOK
+            return _MOD_OOK
             
     @staticmethod
-    def extract_pulses(samples: np.ndarray, threshold: float = 0.5) -> List[int]:
-        """Extract pulse lengths from raw samples."""
-        # Convert to amplitude
-        amplitude = np.abs(samples)
+    def extract_pulses(samples: np.ndarray, threshold: float = 0.5) -> np.ndarray:
+        """Extract pulse lengths (in samples) from raw samples."""
+        # Threshold amplitude to binary signal
+        binary = _above_threshold(samples, threshold)
         
-        # Threshold to binary signal
-        binary = amplitude > threshold
+        # Transitions are where neighbouring bools differ; no int diff needed
+        transition_points = np.flatnonzero(binary[1:] != binary[:-1])
         
-        # Find transitions
-        transitions = np.diff(binary.astype(int))
-        transition_points = np.where(transitions != 0)[0]
-        
-        # Calculate pulse lengths
-        if len(transition_points) < 2:
-            return []
-            
-        pulses = []
-        for i in range(len(transition_points) - 1):
-            pulse_length = transition_points[i + 1] - transition_points[i]
-            pulses.append(pulse_length)
-            
-        return pulses
+        # Pulse lengths are the gaps between consecutive transitions
+        return np.diff(transition_points)
         
     @staticmethod
-    def detect_bit_rate(pulses: List[int]) -> float:
+    def detect_bit_rate(pulses: np.ndarray) -> float:
         """Estimate bit rate from pulse lengths."""
-        if not pulses:
+        if len(pulses) == 0:
             return 0.0
             
-        # Find most common pulse length (mode)
-        pulse_counts = {}
-        for pulse in pulses:
-            pulse_counts[pulse] = pulse_counts.get(pulse, 0) + 1
-            
-        base_length = max(pulse_counts.items(), key=lambda x: x[1])[0]
+        # Find most common pulse length (mode); lengths are sample counts,
+        # so a histogram over them is one C pass. bincount sizes its output
+        # by the longest pulse, so a long idle gap falls back to np.unique
+        pulses = np.asarray(pulses)
+        if np.issubdtype(pulses.dtype, np.integer) and pulses.max() <= _BINCOUNT_MAX_LENGTH:
+            base_length = int(np.argmax(np.bincount(pulses)))
+        else:
+            lengths, counts = np.unique(pulses, return_counts=True)
+            base_length = lengths[np.argmax(counts)]
         return 1000000 / base_length  # Convert to bits per second
         
     @staticmethod
-    def decode_manchester(pulses: List[int], tolerance: float = 0.2) -> Optional[bytes]:
+    def decode_manchester(pulses: np.ndarray, tolerance: float = 0.2) -> Optional[bytes]:
         """Decode Manchester encoded data."""
-        if not pulses or len(pulses) < 2:
+        if len(pulses) < 2:
             return None
             
-        # Estimate base clock period
-        clock = min(pulses)
-        bits = []
+        # Estimate base clock period; a low percentile rather than the
+        # minimum so one short glitch doesn't skew it for the whole packet
+        pulses = np.asarray(pulses)
+        clock = float(np.percentile(pulses, 10))
         
-        i = 0
-        while i < len(pulses) - 1:
-            p1, p2 = pulses[i], pulses[i + 1]
-            
-            # Check if pulse pair matches Manchester pattern
-            if abs(p1 - clock) <= tolerance * clock and abs(p2 - clock) <= tolerance * clock:
-                if p1 > p2:
-                    bits.append(1)  # Rising edge
-                else:
-                    bits.append(0)  # Falling edge
-                i += 2
-            else:
-                # Invalid Manchester code
-                return None
-                
-        # Convert bits to bytes
-        if not bits:
+        # Pair up pulses; an odd trailing pulse has no partner and is ignored
+        pairs = len(pulses) // 2
+        p1 = pulses[0:2 * pairs:2]
+        p2 = pulses[1:2 * pairs:2]
+        
+        # Every pair must match the Manchester pattern
+        limit = tolerance * clock
+        valid = (np.abs(p1 - clock) <= limit) & (np.abs(p2 - clock) <= limit)
+        if not valid.all():
             return None
             
-        result = bytearray()
-        for i in range(0, len(bits), 8):
-            if i + 8 <= len(bits):
-                byte = 0
-                for j in range(8):
-                    byte = (byte << 1) | bits[i + j]
-                result.append(byte)
-                
-        return bytes(result)
+        # Rising edge (long-then-short) is a 1, falling edge a 0
+        bits = (p1 > p2).astype(np.uint8)
+        
+        # Pack whole bytes only, MSB first; a trailing partial byte is dropped
+        return np.packbits(bits[:len(bits) - len(bits) % 8]).tobytes()
+
+# Pulse decoder per DecodingType; types without one are skipped by analyze
+_DECODERS = {
+    DecodingType.MANCHESTER: SignalAnalyzer.decode_manchester,
+}
+
+
+def _quantize_iq(samples: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Scale complex samples to int8 I/Q pairs of shape (N, 2)."""
+    iq = np.asarray(samples, dtype=_SAMPLE_DTYPE).view(np.float32).reshape(-1, 2)
+    peak = float(np.abs(iq).max()) if iq.size else 0.0
+    scale = np.float32(peak / 127 if peak > 0 else 1.0)
+    return np.rint(iq / scale).astype(np.int8), scale
+
+
+def _dequantize_iq(iq: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    """Inverse of _quantize_iq, back to complex64."""
+    return (iq.astype(np.float32) * np.float32(scale)).view(_SAMPLE_DTYPE).ravel()
+
 
 class SubGHzSignal:
     """Container for captured Sub-GHz signals."""
     
+    __slots__ = (
+        'frequency', 'modulation', '_chunks', 'pulses',
+        'decoded_data', 'protocol', 'metadata',
+    )
+    
     def __init__(self, frequency: float, modulation: ModulationType):
         """Initialize signal container."""
         self.frequency = frequency
         self.modulation = modulation
-        self.raw_samples = np.array([], dtype=np.complex64)
-        self.pulses = []
+        # Captured chunks, joined lazily by the raw_samples property
+        self._chunks: List[np.ndarray] = [np.array([], dtype=_SAMPLE_DTYPE)]
+        self.pulses = np.array([], dtype=np.intp)
         self.decoded_data: Optional[bytes] = None
         self.protocol: Optional[str] = None
         self.metadata: Dict = {}
         
+    @property
+    def raw_samples(self) -> np.ndarray:
+        """All captured samples as one contiguous complex64 array.
+        
+        .real and .imag are float32 views; no complex128 copy is made.
+        """
+        if len(self._chunks) > 1:
+            self._chunks = [np.concatenate(self._chunks)]
+        return self._chunks[0]
+        
+    @raw_samples.setter
+    def raw_samples(self, samples: np.ndarray):
+        self._chunks = [np.ascontiguousarray(samples, dtype=_SAMPLE_DTYPE)]
+        
     def add_samples(self, samples: np.ndarray):
         """Add raw samples to signal."""
-        self.raw_samples = np.concatenate([self.raw_samples, samples])
+        # Join lazily on read so a streaming capture stays O(n); copy the
+        # chunk since callers may reuse their receive buffer, narrowing
+        # complex128/float64 input to float32 I/Q on the way
+        self._chunks.append(np.array(samples, dtype=_SAMPLE_DTYPE))
         
     def analyze(self):
         """Analyze signal and attempt protocol detection."""
-        if len(self.raw_samples) == 0:
+        # Find candidate protocols first; with none there is nothing to
+        # decode, so skip the O(n) pulse work (e.g. during spectrum sweeps)
+        candidates = [
+            protocol_info
+            for protocol_info in SubGHzProtocolRegistry.get_protocols_for_frequency(
+                self.frequency
+            )
+            if protocol_info.modulation is self.modulation
+        ]
+        if not candidates or len(self.raw_samples) == 0:
             return
             
         # Extract pulses
         self.pulses = SignalAnalyzer.extract_pulses(self.raw_samples)
-        if not self.pulses:
+        if len(self.pulses) == 0:
             return
             
         # Estimate bit rate
         bit_rate = SignalAnalyzer.detect_bit_rate(self.pulses)
         self.metadata['bit_rate'] = bit_rate
         
-        # Try to identify protocol
-        potential_protocols = SubGHzProtocolRegistry.get_protocols_for_frequency(
-            self.frequency
-        )
-        
-        for protocol_info in potential_protocols:
-            if protocol_info.modulation == self.modulation:
-                # Try decoding
-                if protocol_info.decode_type == DecodingType.MANCHESTER:
-                    data = SignalAnalyzer.decode_manchester(self.pulses)
-                    if data:
-                        self.decoded_data = data
-                        self.protocol = protocol_info.name
-                        return
+        # Decoders depend only on the pulses, so each runs at most once
+        # however many candidate protocols share its decode type
+        decoded = {}
+        for protocol_info in candidates:
+            decode_type = protocol_info.decode_type
+            if decode_type not in decoded:
+                decoder = _DECODERS.get(decode_type)
+                decoded[decode_type] = decoder(self.pulses) if decoder else None
+            data = decoded[decode_type]
+            if data:
+                self.decoded_data = data
+                self.protocol = protocol_info.name
+                return
                         
-    def to_file(self, path: Path) -> bool:
-        """Save signal to file."""
+    def to_file(self, path: Path, quantize: bool = False) -> bool:
+        """Save signal to file.
+        
+        The file is an uncompressed NumPy ``.npz`` archive: ``samples`` holds
+        the raw complex64 samples as-is, ``meta`` the JSON-encoded fields and
+        ``decoded`` the decoded payload (if any).
+        
+        With ``quantize`` the samples are instead stored as int8 I/Q pairs
+        (``samples_i8`` plus a float ``scale``), a quarter of the size. This
+        matches the 8-bit resolution of typical SDR front-ends; use it for
+        archival captures, not where full float precision matters.
+        """
         try:
-            data = {
+            meta = {
                 "frequency": self.frequency,
                 "modulation": self.modulation.value,
                 "protocol": self.protocol,
                 "metadata": self.metadata,
-                "raw_samples": self.raw_samples.tobytes().hex(),
-                "decoded_data": self.decoded_data.hex() if self.decoded_data else None
             }
+            arrays = {"meta": np.frombuffer(_dumps(meta), dtype=np.uint8)}
+            if quantize:
+                arrays["samples_i8"], arrays["scale"] = _quantize_iq(self.raw_samples)
+            else:
+                arrays["samples"] = self.raw_samples
+            if self.decoded_data:
+                arrays["decoded"] = np.frombuffer(self.decoded_data, dtype=np.uint8)
             
-            with open(path, 'w') as f:
-                json.dump(data, f, indent=2)
+            # Write through a handle so numpy keeps the caller's file name
+            with open(path, 'wb') as f:
+                np.savez(f, **arrays)
             return True
         except Exception as e:
             logger.error(f"Failed to save signal: {e}")
@@ -268,31 +476,57 @@ class SubGHzSignal:
             
     @classmethod
     def from_file(cls, path: Path) -> Optional['SubGHzSignal']:
-        """Load signal from file."""
+        """Load signal from file (``.npz`` archive or legacy JSON+hex)."""
         try:
-            with open(path, 'r') as f:
-                data = json.load(f)
-                
-            signal = cls(
-                frequency=data["frequency"],
-                modulation=ModulationType(data["modulation"])
-            )
-            
-            signal.raw_samples = np.frombuffer(
-                bytes.fromhex(data["raw_samples"]),
-                dtype=np.complex64
-            )
-            
-            if data["decoded_data"]:
-                signal.decoded_data = bytes.fromhex(data["decoded_data"])
+            with open(path, 'rb') as f:
+                is_archive = f.read(len(_NPZ_MAGIC)) == _NPZ_MAGIC
+            if not is_archive:
+                return cls._from_legacy_json(path)
                 
-            signal.protocol = data["protocol"]
-            signal.metadata = data["metadata"]
+            with np.load(path) as archive:
+                meta = _loads(archive["meta"].tobytes())
+                signal = cls(
+                    frequency=meta["frequency"],
+                    modulation=_MODULATION_BY_VALUE[meta["modulation"]]
+                )
+                if "samples_i8" in archive.files:
+                    signal.raw_samples = _dequantize_iq(archive["samples_i8"], archive["scale"])
+                else:
+                    signal.raw_samples = archive["samples"]
+                if "decoded" in archive.files:
+                    signal.decoded_data = archive["decoded"].tobytes()
+                    
+            signal.protocol = meta["protocol"]
+            signal.metadata = meta["metadata"]
             
             return signal
         except Exception as e:
             logger.error(f"Failed to load signal: {e}")
             return None
+            
+    @classmethod
+    def _from_legacy_json(cls, path: Path) -> 'SubGHzSignal':
+        """Read the older JSON format with hex-encoded samples."""
+        with open(path, 'rb') as f:
+            data = _loads(f.read())
+            
+        signal = cls(
+            frequency=data["frequency"],
+            modulation=_MODULATION_BY_VALUE[data["modulation"]]
+        )
+        
+        signal.raw_samples = np.frombuffer(
+            bytes.fromhex(data["raw_samples"]),
+            dtype=np.complex64
+        )
+        
+        if data["decoded_data"]:
+            signal.decoded_data = bytes.fromhex(data["decoded_data"])
+            
+        signal.protocol = data["protocol"]
+        signal.metadata = data["metadata"]
+        
+        return signal
 
 """
 Sub-GHz protocol logic for Flipper Zero integration.
@@ -358,4 +592,4 @@ class SubGhzManager:
             return bool(ack)
         except Exception as e:
             logger.error(f"Sub-GHz replay failed: {e}")
-            return False
\ No newline at end of file
+            return False
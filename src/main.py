@@ -3,26 +3,52 @@
 import asyncio
 import tkinter as tk
 from tkinter import ttk, messagebox
-from ttkthemes import ThemedTk
 from pathlib import Path
 from typing import Dict, Any, Optional
 import threading
-import queue
 import functools
+import collections
 import logging
 
 from .utils.config import load_config
 from .device.ble_adapter import BLEAdapter
 from .device.flipper_zero import FlipperZeroDevice, FlipperMode, FlipperSignal
 
+try:  # asyncio.Runner is Python 3.11+
+    _Runner = asyncio.Runner
+except AttributeError:  # pragma: no cover - Python 3.10
+    _Runner = None
+
+# ttkthemes is imported when the theme is applied, see _themed_style()
+ThemedStyle = None
+
+def _themed_style():
+    """Return ttkthemes.ThemedStyle, importing it on first use."""
+    global ThemedStyle
+    if ThemedStyle is None:
+        from ttkthemes import ThemedStyle as themed_style
+        ThemedStyle = themed_style
+    return ThemedStyle
+
 class HydraRemoteGUI:
+    # Activity log lines kept in the Text widget
+    LOG_MAX_LINES = 500
+    
     def __init__(self):
         """Initialize the GUI window and components."""
         self.config = load_config()
-        self.window = ThemedTk(theme=self.config.get("ui", {}).get("theme", "arc"))
+        # Resolve settings once; handlers read the attributes
+        ui_config = self.config.get("ui", {})
+        window_config = ui_config.get("window", {})
+        self._theme = ui_config.get("theme", "arc")
+        self._scan_timeout = self.config.get("ble", {}).get("scan_timeout", 5.0)
+        
+        # Plain root first; loading the theme's images waits until idle so
+        # the window can be laid out and painted before that work
+        self.window = tk.Tk()
+        self.window.after_idle(self._apply_theme, self._theme)
         
         # Configure window
-        window_config = self.config.get("ui", {}).get("window", {})
         self.window.title(window_config.get("title", "Hydra Universal Remote"))
         self.window.geometry(f"{window_config.get('width', 1000)}x{window_config.get('height', 800)}")
         
@@ -39,15 +65,34 @@ class HydraRemoteGUI:
         self.current_mode = None
         self.current_signal = None
         
-        # Setup async event loop
-        self.loop = asyncio.new_event_loop()
-        self.queue = queue.Queue()
+        # Setup async event loop; started here so scheduling a task is a
+        # single call_soon_threadsafe with no thread check. The Runner
+        # owns the loop so shutdown cancels tasks and closes it cleanly
+        self._runner = _Runner() if _Runner is not None else None
+        self.loop = self._runner.get_loop() if self._runner else asyncio.new_event_loop()
         self.thread = None
+        self._submit = functools.partial(self.loop.call_soon_threadsafe, self._start_task)
+        self._create_async_thread()
+        
+        # Running tasks and their on_result callbacks. Holds the only strong
+        # reference to each task; only touched on the asyncio thread
+        self._tasks = {}
+        # Finished (task, on_result) pairs handed from the asyncio thread to
+        # Tk. deque append/popleft are atomic, so no lock for this SPSC hop
+        self._results = collections.deque()
+        self._drain_scheduled = False
         
         # Configure logging
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(logging.INFO)
     
+    def _apply_theme(self, theme):
+        """Load and apply a ttkthemes theme to the window."""
+        try:
+            _themed_style()(self.window).set_theme(theme)
+        except tk.TclError as e:
+            self.logger.warning(f"Failed to apply theme {theme}: {e}")
+    
     def _create_widgets(self):
         """Create and layout all GUI widgets."""
         # Configure main window grid
@@ -105,6 +150,13 @@ class HydraRemoteGUI:
         )
         self.disconnect_button.grid(row=0, column=1, padx=2)
         
+        # Bound configure methods for the connection buttons; see _set_states
+        self._button_config = {
+            "scan": self.scan_button.configure,
+            "connect": self.connect_button.configure,
+            "disconnect": self.disconnect_button.configure,
+        }
+        
         # Create notebook for different modes
         self.notebook = ttk.Notebook(self.main_frame)
         self.notebook.grid(row=0, column=1, sticky=(tk.W, tk.E, tk.N, tk.S), padx=5)
@@ -121,6 +173,7 @@ class HydraRemoteGUI:
         
         # Add log text widget with scrollbar
         self.log_text = tk.Text(log_frame, height=6, wrap=tk.WORD)
+        self._log_lines = 0
         self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E))
         
         scrollbar = ttk.Scrollbar(log_frame, orient=tk.VERTICAL, command=self.log_text.yview)
@@ -218,7 +271,7 @@ class HydraRemoteGUI:
         self.remote_buttons.grid(row=0, column=0, sticky=(tk.W, tk.E))
     
     def _create_async_thread(self):
-        """Create and start the async event loop thread."""
+        """Create and start the one persistent async event loop thread."""
         if self.thread is not None:
             return
             
@@ -229,48 +282,89 @@ class HydraRemoteGUI:
         self.thread = threading.Thread(target=run_async_loop, daemon=True)
         self.thread.start()
         
-    def _queue_async_task(self, coro):
-        """Queue an async task and handle its result in the main thread."""
-        if self.thread is None:
-            self._create_async_thread()
+    def _shutdown_async(self):
+        """Stop the loop thread, then cancel leftover tasks and close the loop."""
+        if self.loop.is_closed():
+            return
+        if self.thread is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout=5.0)
+            if self.thread.is_alive():
+                # A blocking call is stuck on the loop; leave it to the daemon thread
+                return
+        if self._runner is not None:
+            self._runner.close()
+        else:
+            # What Runner.close() does, for Python 3.10
+            pending = asyncio.all_tasks(self.loop)
+            for task in pending:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+        
+    def _queue_async_task(self, coro, on_result=None):
+        """Queue an async task and handle its result in the main thread.
+        
+        If given, on_result(result) is called on the Tk thread once the
+        task succeeds; otherwise a successful result is dropped. A failure
+        is shown in the status label either way.
+        """
+        # One call_soon_threadsafe per click; unlike run_coroutine_threadsafe
+        # no concurrent Future is created and chained to the task
+        self._submit(coro, on_result)
+        
+    def _start_task(self, coro, on_result):
+        """Start a queued coroutine; runs on the asyncio thread."""
+        # No wrapper coroutine or closure per task, the done callback is
+        # one shared bound method
+        task = self.loop.create_task(coro)
+        self._tasks[task] = on_result
+        task.add_done_callback(self._on_task_done)
+        
+    def _on_task_done(self, task):
+        """Hand a finished task to Tk; runs on the asyncio thread."""
+        self._results.append((task, self._tasks.pop(task, None)))
+        # One Tk callback drains a whole burst of results
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            self._post_to_ui(self._drain_results)
             
-        async def handle_task():
-            try:
-                result = await coro
-                self.queue.put(("success", result))
-            except Exception as e:
-                self.queue.put(("error", str(e)))
-                
-        asyncio.run_coroutine_threadsafe(handle_task(), self.loop)
-    
-    def _process_queue(self):
-        """Process async results from the queue."""
+    def _drain_results(self):
+        """Apply every queued task result on the Tk thread."""
+        # Clear the flag before draining so a result appended meanwhile
+        # either gets drained here or schedules a fresh drain
+        self._drain_scheduled = False
+        while self._results:
+            self._handle_task_result(*self._results.popleft())
+        
+    def _post_to_ui(self, callback, *args):
+        """Schedule callback on the Tk main loop from any thread."""
         try:
-            while True:
-                status, result = self.queue.get_nowait()
-                if status == "success" and isinstance(result, list):
-                    # Update device list with scan results
-                    self.device_list.delete(0, tk.END)
-                    for device in result:
-                        name = device["name"] or "Unknown Device"
-                        addr = device["address"]
-                        self.device_list.insert(tk.END, f"{name} ({addr})")
-                    self.devices = result
-                    self.selected_device_index = None
-                    self.connect_button.config(state="disabled")
-                    self.status_label.config(text=f"Found {len(result)} devices")
-                elif status == "error":
-                    self.status_label.config(text=f"Error: {result}")
-                    
-                self.scanning = False
-                self.scan_button.config(state="normal")
-        except queue.Empty:
+            self.window.after(0, callback, *args)
+        except (tk.TclError, RuntimeError):
+            # Window already destroyed; nothing left to update
             pass
+    
+    def _handle_task_result(self, future, on_result=None):
+        """Apply a finished async task's result to the UI."""
+        if future.cancelled():
+            status, result = "error", "cancelled"
+        elif future.exception() is not None:
+            status, result = "error", str(future.exception())
+        else:
+            status, result = "success", future.result()
             
-        # Schedule next queue check
-        if not self.window.winfo_exists():
-            return
-        self.window.after(100, self._process_queue)
+        if status == "success" and on_result is not None:
+            on_result(result)
+        elif status == "error":
+            self.status_label.config(text=f"Error: {result}")
+    
+    def _set_states(self, **states):
+        """Set connection button states, e.g. _set_states(scan="normal")."""
+        button_config = self._button_config
+        for name, state in states.items():
+            button_config[name](state=state)
     
     def _start_scan(self):
         """Start BLE device scan."""
@@ -278,73 +372,120 @@ class HydraRemoteGUI:
             return
             
         self.scanning = True
-        self.scan_button.config(state="disabled")
+        self._set_states(scan="disabled", connect="disabled", disconnect="disabled")
         self.status_label.config(text="Scanning...")
         self.device_list.delete(0, tk.END)
-        self.connect_button.config(state="disabled")
-        self.disconnect_button.config(state="disabled")
+        self.devices = []
+        self.selected_device_index = None
         
-        # Queue the scan operation
-        timeout = self.config.get("ble", {}).get("scan_timeout", 5.0)
-        self._queue_async_task(self.ble.scan(timeout=timeout))
+        # Queue the scan operation; devices show up as they are discovered
+        self._queue_async_task(self._async_scan())
+
+    async def _async_scan(self):
+        try:
+            devices = await self.ble.scan(timeout=self._scan_timeout, callback=self._on_device_found)
+            error = None
+        except Exception as e:
+            devices, error = [], str(e)
+        # Queued behind every _add_device posted during the scan
+        self._post_to_ui(self._finish_scan, devices, error)
+
+    @staticmethod
+    def _device_label(device):
+        return f"{device.name or 'Unknown Device'} ({device.address})"
+
+    def _on_device_found(self, device):
+        """Scan callback; runs on the asyncio thread."""
+        self._post_to_ui(self._add_device, device)
+
+    def _add_device(self, device):
+        self.devices.append(device)
+        self.device_list.insert(tk.END, self._device_label(device))
+
+    def _finish_scan(self, result, error=None):
+        """End the scan, appending any devices whose streamed update has not landed yet."""
+        # The scan result keeps first-seen order, so only its tail can be missing
+        missing = result[len(self.devices):]
+        if missing:
+            # One Tcl call for the rest instead of one per device
+            self.device_list.insert(tk.END, *map(self._device_label, missing))
+            self.devices.extend(missing)
+        if error is not None:
+            self.status_label.config(text=f"Scan error: {error}")
+        else:
+            self.status_label.config(text=f"Found {len(self.devices)} devices")
+        self.scanning = False
+        self._set_states(scan="normal")
 
     def _on_device_select(self, event):
         selection = self.device_list.curselection()
         if selection:
             self.selected_device_index = selection[0]
-            self.connect_button.config(state="normal")
+            self._set_states(connect="normal")
         else:
             self.selected_device_index = None
-            self.connect_button.config(state="disabled")
+            self._set_states(connect="disabled")
 
     def _connect_selected_device(self):
         if self.selected_device_index is None or not self.devices:
             return
         device = self.devices[self.selected_device_index]
-        address = device["address"]
+        address = device.address
         self.status_label.config(text=f"Connecting to {address}...")
-        self.connect_button.config(state="disabled")
-        self.scan_button.config(state="disabled")
+        self._set_states(scan="disabled", connect="disabled")
         self._queue_async_task(self._async_connect(address))
 
     async def _async_connect(self, address):
         try:
             connected = await self.ble.connect(address)
-            if connected:
-                self.status_label.config(text=f"Connected to {address}")
-                self.disconnect_button.config(state="normal")
-                self.connect_button.config(state="disabled")
-                self.scan_button.config(state="disabled")
+            error = None
+        except Exception as e:
+            connected, error = False, str(e)
+        # Widgets belong to the Tk thread; push the update there
+        self._post_to_ui(self._show_connect_result, address, connected, error)
+        
+    def _show_connect_result(self, address, connected, error):
+        if connected:
+            self.status_label.config(text=f"Connected to {address}")
+            self._set_states(scan="disabled", connect="disabled", disconnect="normal")
+        else:
+            if error is not None:
+                self.status_label.config(text=f"Connect error: {error}")
             else:
                 self.status_label.config(text=f"Failed to connect to {address}")
-                self.disconnect_button.config(state="disabled")
-                self.connect_button.config(state="normal")
-                self.scan_button.config(state="normal")
-        except Exception as e:
-            self.status_label.config(text=f"Connect error: {str(e)}")
-            self.disconnect_button.config(state="disabled")
-            self.connect_button.config(state="normal")
-            self.scan_button.config(state="normal")
+            self._set_states(scan="normal", connect="normal", disconnect="disabled")
 
     def _disconnect_device(self):
         self.status_label.config(text="Disconnecting...")
-        self.disconnect_button.config(state="disabled")
+        self._set_states(disconnect="disabled")
         self._queue_async_task(self._async_disconnect())
 
     async def _async_disconnect(self):
         try:
             await self.ble.disconnect()
             await self.flipper.disconnect()
-            self.status_label.config(text="Disconnected")
-            self.connect_button.config(state="disabled")
-            self.scan_button.config(state="normal")
+            error = None
         except Exception as e:
-            self.status_label.config(text=f"Disconnect error: {str(e)}")
-            self.scan_button.config(state="normal")
+            error = str(e)
+        self._post_to_ui(self._show_disconnect_result, error)
+        
+    def _show_disconnect_result(self, error):
+        if error is None:
+            self.status_label.config(text="Disconnected")
+            self._set_states(connect="disabled")
+        else:
+            self.status_label.config(text=f"Disconnect error: {error}")
+        self._set_states(scan="normal")
     
     def log_message(self, message: str):
-        """Add message to log area."""
+        """Add message to log area, keeping the last LOG_MAX_LINES lines."""
         self.log_text.insert(tk.END, f"{message}\n")
+        self._log_lines += 1
+        if self._log_lines > self.LOG_MAX_LINES:
+            # Drop the oldest lines so the widget (and see()) stays O(1)
+            excess = self._log_lines - self.LOG_MAX_LINES
+            self.log_text.delete("1.0", f"{excess + 1}.0")
+            self._log_lines = self.LOG_MAX_LINES
         self.log_text.see(tk.END)
         self.logger.info(message)
         
@@ -377,8 +518,7 @@ class HydraRemoteGUI:
     def _read_rfid(self):
         """Read RFID card."""
         self.log_message("Reading RFID card...")
-        async def read_and_update():
-            signal = await self.flipper.read_rfid()
+        def show(signal):
             if signal:
                 self.current_signal = signal
                 self.rfid_data.delete(1.0, tk.END)
@@ -386,7 +526,7 @@ class HydraRemoteGUI:
                 self.log_message("RFID card read successfully")
             else:
                 self.log_message("Failed to read RFID card")
-        self._queue_async_task(read_and_update())
+        self._queue_async_task(self.flipper.read_rfid(), on_result=show)
         
     def _write_rfid(self):
         """Write to RFID card."""
@@ -410,8 +550,7 @@ class HydraRemoteGUI:
     def _read_nfc(self):
         """Read NFC tag."""
         self.log_message("Reading NFC tag...")
-        async def read_and_update():
-            signal = await self.flipper.read_nfc()
+        def show(signal):
             if signal:
                 self.current_signal = signal
                 self.nfc_data.delete(1.0, tk.END)
@@ -419,7 +558,7 @@ class HydraRemoteGUI:
                 self.log_message("NFC tag read successfully")
             else:
                 self.log_message("Failed to read NFC tag")
-        self._queue_async_task(read_and_update())
+        self._queue_async_task(self.flipper.read_nfc(), on_result=show)
         
     def _write_nfc(self):
         """Write to NFC tag."""
@@ -443,14 +582,13 @@ class HydraRemoteGUI:
     def _record_ir(self):
         """Record IR signal."""
         self.log_message("Recording IR signal...")
-        async def record_and_update():
-            signal = await self.flipper.record_ir()
+        def show(signal):
             if signal:
                 self.current_signal = signal
                 self.log_message("IR signal recorded successfully")
             else:
                 self.log_message("Failed to record IR signal")
-        self._queue_async_task(record_and_update())
+        self._queue_async_task(self.flipper.record_ir(), on_result=show)
         
     def _transmit_ir(self):
         """Transmit IR signal."""
@@ -464,26 +602,24 @@ class HydraRemoteGUI:
     def _learn_remote(self):
         """Learn IR remote control buttons."""
         self.log_message("Starting IR remote learning mode...")
-        async def learn_and_update():
-            signals = await self.flipper.learn_remote()
+        def show(signals):
             if signals:
                 self.remote_buttons.delete(1.0, tk.END)
-                for i, signal in enumerate(signals, 1):
-                    self.remote_buttons.insert(tk.END, f"Button {i}: {signal.protocol}\n")
+                # Build the text once; one Tcl insert instead of one per button
+                self.remote_buttons.insert(tk.END, "".join(
+                    f"Button {i}: {signal.protocol}\n" for i, signal in enumerate(signals, 1)
+                ))
                 self.log_message(f"Learned {len(signals)} IR buttons")
             else:
                 self.log_message("Failed to learn IR remote")
-        self._queue_async_task(learn_and_update())
+        self._queue_async_task(self.flipper.learn_remote(), on_result=show)
     
     def run(self):
         """Start the GUI event loop."""
-        # Start queue processing
-        self._process_queue()
         # Run the main loop
         self.window.mainloop()
         # Cleanup
-        if self.loop.is_running():
-            self.loop.call_soon_threadsafe(self.loop.stop)
+        self._shutdown_async()
 
 def main():
     """Application entry point."""
@@ -7,11 +7,13 @@ class BLEDeviceNotFound(Exception):
     """Raised when a BLE device cannot be found."""
     pass
 
-async def scan_for_devices(timeout: float = 5.0) -> List[Dict[str, Any]]:
+async def scan_for_devices(timeout: float = 5.0,
+                           service_uuids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
     """Scan for BLE devices.
     
     Args:
         timeout: How long to scan for devices in seconds
+        service_uuids: Optional advertised service UUIDs to filter on in the OS stack
         
     Returns:
         List of discovered devices with their properties
@@ -24,9 +26,9 @@ async def scan_for_devices(timeout: float = 5.0) -> List[Dict[str, Any]]:
     except ImportError:
         raise RuntimeError("bleak package is required for BLE functionality")
         
-    devices = []
-    async with BleakScanner() as scanner:
-        devices = await scanner.discover(timeout=timeout)
+    async with BleakScanner(service_uuids=service_uuids) as scanner:
+        await asyncio.sleep(timeout)
+        devices = scanner.discovered_devices
         
     return [
         {
@@ -72,10 +74,10 @@ async def list_services(client: Any) -> List[Dict[str, str]]:
     Returns:
         List of service UUIDs and descriptions
     """
-    services = []
-    for service in client.services:
-        services.append({
+    return [
+        {
             "uuid": service.uuid,
             "description": service.description or "Unknown service"
-        })
-    return services
\ No newline at end of file
+        }
+        for service in client.services
+    ]
\ No newline at end of file
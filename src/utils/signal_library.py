@@ -55,7 +55,7 @@ class SignalLibrary:
             Loaded signal or None if loading fails
         """
         try:
-            if file_path.suffix == '.json':
+            if file_path.suffix in ('.npz', '.json'):
                 return SubGHzSignal.from_file(file_path)
             elif file_path.suffix == '.sub':
                 # Parse Flipper Zero .sub file format
@@ -117,7 +117,7 @@ class SignalLibrary:
             )
             
             # Save signal file
-            signal_path = category_path / f"{name}.json"
+            signal_path = category_path / f"{name}.npz"
             if signal.to_file(signal_path):
                 self.signals[name] = metadata
                 self._save_metadata()
@@ -142,7 +142,10 @@ class SignalLibrary:
             return None
             
         metadata = self.signals[name]
-        signal_path = self.base_path / metadata.category / f"{name}.json"
+        signal_path = self.base_path / metadata.category / f"{name}.npz"
+        if not signal_path.exists():
+            # Signals added before the .npz format
+            signal_path = signal_path.with_suffix('.json')
         return SubGHzSignal.from_file(signal_path)
         
     def get_categories(self) -> List[str]:
@@ -252,7 +255,7 @@ class SignalLibrary:
         """
         count = 0
         for file_path in Path(directory).rglob("*"):
-            if file_path.suffix in ['.json', '.sub']:
+            if file_path.suffix in ['.npz', '.json', '.sub']:
                 signal = self.load_signal_file(file_path)
                 if signal:
                     # Use filename as signal name
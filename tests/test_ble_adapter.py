@@ -1,39 +1,65 @@
 """Unit tests for the BLEAdapter class focusing on error handling."""
 
 import unittest
-from unittest.mock import patch, MagicMock, AsyncMock
+from unittest.mock import patch, MagicMock
 import asyncio
+import importlib.util
 import sys
 
+from src.device import ble_adapter
 from src.device.ble_adapter import BLEAdapter, BLENotAvailable
 
+class FakeCallbackScanner:
+    """Minimal BleakScanner stand-in that replays advertisements on start."""
+
+    advertisements = []
+    error = None
+    last_kwargs = None
+    starts = 0
+
+    def __init__(self, detection_callback=None, **kwargs):
+        self._callback = detection_callback
+        FakeCallbackScanner.last_kwargs = kwargs
+
+    async def start(self):
+        if self.error is not None:
+            raise self.error
+        FakeCallbackScanner.starts += 1
+        for device in self.advertisements:
+            self._callback(device, MagicMock(rssi=-60))
+
+    async def stop(self):
+        pass
+
 class TestBLEAdapter(unittest.TestCase):
     """Test BLEAdapter initialization and error handling."""
     
     def test_init_bleak_not_available(self):
         """Test BLEAdapter initialization when bleak cannot be imported."""
-        with patch.dict(sys.modules, {'bleak': None}):
+        with patch('src.device.ble_adapter._BLEAK_SCANNER_CLS', None):
             adapter = BLEAdapter()
             self.assertFalse(adapter.available)
     
     def test_init_bleak_import_error(self):
         """Test BLEAdapter handles arbitrary errors during bleak import."""
         with patch.dict(sys.modules, {'bleak': None}):
-            adapter = BLEAdapter()
+            # bleak is imported at module scope, so load a fresh copy
+            spec = importlib.util.find_spec('src.device.ble_adapter')
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            adapter = module.BLEAdapter()
             self.assertFalse(adapter.available)
     
     def test_init_bleak_success(self):
         """Test BLEAdapter successful initialization."""
-        with patch('bleak.BleakScanner'):
+        with patch('src.device.ble_adapter._BLEAK_SCANNER_CLS', MagicMock()):
             adapter = BLEAdapter()
             self.assertTrue(adapter.available)
     
     async def async_scan_error(self):
         """Test BLEAdapter scan when backend raises an error."""
-        mock_scanner_class = AsyncMock()
-        mock_scanner_class.discover = AsyncMock(side_effect=OSError("Mock hardware error"))
-        
-        with patch('bleak.BleakScanner', mock_scanner_class):
+        with patch('src.device.ble_adapter._BLEAK_SCANNER_CLS', FakeCallbackScanner), \
+                patch.object(FakeCallbackScanner, 'error', OSError("Mock hardware error")):
             adapter = BLEAdapter()
             with self.assertRaises(OSError):
                 await adapter.scan()
@@ -44,7 +70,7 @@ class TestBLEAdapter(unittest.TestCase):
     
     async def async_scan_not_available(self):
         """Test BLEAdapter scan when bleak is not available."""
-        with patch.dict(sys.modules, {'bleak': None}):
+        with patch('src.device.ble_adapter._BLEAK_SCANNER_CLS', None):
             adapter = BLEAdapter()
             with self.assertRaises(BLENotAvailable):
                 await adapter.scan()
@@ -59,20 +85,208 @@ class TestBLEAdapter(unittest.TestCase):
         mock_device.address = "00:11:22:33:44:55"
         mock_device.name = "Test Device"
         
-        mock_scanner_class = AsyncMock()
-        mock_scanner_class.discover = AsyncMock(return_value=[mock_device])
-        
-        with patch('bleak.BleakScanner', mock_scanner_class):
+        with patch('src.device.ble_adapter._BLEAK_SCANNER_CLS', FakeCallbackScanner), \
+                patch.object(FakeCallbackScanner, 'advertisements', [mock_device]):
             adapter = BLEAdapter()
-            devices = await adapter.scan()
+            devices = await adapter.scan(timeout=0.01)
             
             self.assertEqual(len(devices), 1)
-            self.assertEqual(devices[0]["address"], "00:11:22:33:44:55")  
-            self.assertEqual(devices[0]["name"], "Test Device")
+            self.assertEqual(devices[0].address, "00:11:22:33:44:55")  
+            self.assertEqual(devices[0].name, "Test Device")
     
     def test_scan_success(self):
         """Run async test for successful scan."""
         asyncio.run(self.async_scan_success())
 
+    async def async_scan_service_filter(self):
+        """Test service UUID filter is forwarded to the scanner."""
+        with patch('src.device.ble_adapter._BLEAK_SCANNER_CLS', FakeCallbackScanner):
+            adapter = BLEAdapter(service_uuids=["0000180f-0000-1000-8000-00805f9b34fb"])
+            await adapter.scan(timeout=0.01)
+
+            kwargs = FakeCallbackScanner.last_kwargs
+            self.assertEqual(kwargs["service_uuids"], ["0000180f-0000-1000-8000-00805f9b34fb"])
+
+    async def async_scan_backend_args(self):
+        """Test backend keywords and per-call scanning mode reach the scanner."""
+        with patch('src.device.ble_adapter._BLEAK_SCANNER_CLS', FakeCallbackScanner):
+            adapter = BLEAdapter(backend_args={"cb": {"use_bdaddr": False}})
+            await adapter.scan(timeout=0.01, scanning_mode="passive")
+
+            kwargs = FakeCallbackScanner.last_kwargs
+            self.assertEqual(kwargs["cb"], {"use_bdaddr": False})
+            self.assertEqual(kwargs["scanning_mode"], "passive")
+
+    def test_scan_backend_args(self):
+        """Run async test for backend scanner options."""
+        asyncio.run(self.async_scan_backend_args())
+
+    def test_scan_service_filter(self):
+        """Run async test for scanner-side service filtering."""
+        asyncio.run(self.async_scan_service_filter())
+
+    async def async_scan_deduplicates(self):
+        """Test repeated advertisements collapse to one entry per address."""
+        mock_device = MagicMock()
+        mock_device.address = "00:11:22:33:44:55"
+        mock_device.name = "Test Device"
+
+        with patch('src.device.ble_adapter._BLEAK_SCANNER_CLS', FakeCallbackScanner), \
+                patch.object(FakeCallbackScanner, 'advertisements', [mock_device] * 3):
+            adapter = BLEAdapter()
+            devices = await adapter.scan(timeout=0.01)
+
+            self.assertEqual(len(devices), 1)
+            self.assertEqual(devices[0].rssi, -60)
+            self.assertEqual(
+                devices[0].as_dict(),
+                {"address": "00:11:22:33:44:55", "name": "Test Device", "rssi": -60},
+            )
+
+    def test_scan_deduplicates(self):
+        """Run async test for advertisement deduplication."""
+        asyncio.run(self.async_scan_deduplicates())
+
+    async def async_scan_coalesced(self):
+        """Test concurrent scans share one underlying scan."""
+        mock_device = MagicMock()
+        mock_device.address = "00:11:22:33:44:55"
+        mock_device.name = "Test Device"
+
+        with patch('src.device.ble_adapter._BLEAK_SCANNER_CLS', FakeCallbackScanner), \
+                patch.object(FakeCallbackScanner, 'advertisements', [mock_device]):
+            adapter = BLEAdapter()
+            with patch.object(adapter, '_do_scan', wraps=adapter._do_scan) as do_scan:
+                first, second = await asyncio.gather(
+                    adapter.scan(timeout=0.01), adapter.scan(timeout=0.01)
+                )
+
+            self.assertEqual(do_scan.call_count, 1)
+            self.assertEqual([d.address for d in first], [d.address for d in second])
+            self.assertIsNot(first, second)
+
+    def test_scan_coalesced(self):
+        """Run async test for scan coalescing."""
+        asyncio.run(self.async_scan_coalesced())
+
+    async def async_shorter_scan_does_not_join_longer(self):
+        """Test a short scan is not held up by a longer one in flight."""
+        with patch('src.device.ble_adapter._BLEAK_SCANNER_CLS', FakeCallbackScanner):
+            adapter = BLEAdapter()
+            loop = asyncio.get_running_loop()
+            long_scan = asyncio.ensure_future(adapter.scan(timeout=5.0))
+            await asyncio.sleep(0)
+            started = loop.time()
+            await adapter.scan(timeout=0.01)
+            self.assertLess(loop.time() - started, 1.0)
+            self.assertFalse(long_scan.done())
+            # A longer timeout may still join the running scan
+            with patch.object(adapter, '_do_scan', wraps=adapter._do_scan) as do_scan:
+                joined = asyncio.ensure_future(adapter.scan(timeout=10.0))
+                await asyncio.sleep(0)
+                do_scan.assert_not_called()
+            long_scan.cancel()
+            joined.cancel()
+            await asyncio.gather(long_scan, joined, return_exceptions=True)
+
+    def test_shorter_scan_does_not_join_longer(self):
+        """Run async test for mismatched scan timeouts."""
+        asyncio.run(self.async_shorter_scan_does_not_join_longer())
+
+    async def async_overlapping_scans_share_scanner(self):
+        """Test overlapping scans start the shared OS scan only once."""
+        with patch('src.device.ble_adapter._BLEAK_SCANNER_CLS', FakeCallbackScanner), \
+                patch.object(FakeCallbackScanner, 'starts', 0):
+            adapter = BLEAdapter(scanning_mode="passive")
+            await asyncio.gather(
+                adapter.scan(timeout=0.05),
+                adapter.scan(timeout=0.05, stop_predicate=lambda d: False),
+            )
+            self.assertEqual(FakeCallbackScanner.starts, 1)
+
+    def test_overlapping_scans_share_scanner(self):
+        """Run async test for shared scanner reference counting."""
+        asyncio.run(self.async_overlapping_scans_share_scanner())
+
+    def test_shared_scanner_is_per_event_loop(self):
+        """Test a new asyncio.run gets a scanner bound to its own loop."""
+        async def scan():
+            adapter = BLEAdapter()
+            await adapter.scan(timeout=0.01)
+            return adapter._shared()
+
+        with patch('src.device.ble_adapter._BLEAK_SCANNER_CLS', FakeCallbackScanner), \
+                patch.dict('src.device.ble_adapter._SHARED_SCANNERS', clear=True):
+            first = asyncio.run(scan())
+            second = asyncio.run(scan())
+            self.assertIsNot(first, second)
+            # The first loop's entry is gone: collected or pruned
+            self.assertLessEqual(len(ble_adapter._SHARED_SCANNERS), 1)
+
+    async def async_scan_stop_predicate(self):
+        """Test scan returns as soon as the stop predicate matches."""
+        mock_device = MagicMock()
+        mock_device.address = "00:11:22:33:44:55"
+        mock_device.name = "Flipper Test"
+
+        with patch('src.device.ble_adapter._BLEAK_SCANNER_CLS', FakeCallbackScanner), \
+                patch.object(FakeCallbackScanner, 'advertisements', [mock_device]):
+            adapter = BLEAdapter()
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            devices = await adapter.scan(
+                timeout=5.0,
+                stop_predicate=lambda d: d.name.startswith("Flipper "),
+            )
+
+            self.assertLess(loop.time() - started, 1.0)
+            self.assertEqual(devices[0].address, "00:11:22:33:44:55")
+
+    def test_scan_stop_predicate(self):
+        """Run async test for early-exit scanning."""
+        asyncio.run(self.async_scan_stop_predicate())
+
+    async def async_scan_iter(self):
+        """Test scan_iter yields each device once as it is detected."""
+        first = MagicMock()
+        first.address = "00:11:22:33:44:55"
+        first.name = "Test Device"
+        second = MagicMock()
+        second.address = "66:77:88:99:AA:BB"
+        second.name = None
+
+        with patch('src.device.ble_adapter._BLEAK_SCANNER_CLS', FakeCallbackScanner), \
+                patch.object(FakeCallbackScanner, 'advertisements', [first, first, second]):
+            adapter = BLEAdapter()
+            devices = [d async for d in adapter.scan_iter(timeout=0.01)]
+
+            self.assertEqual([d.address for d in devices], [first.address, second.address])
+
+    def test_scan_iter(self):
+        """Run async test for streaming scan."""
+        asyncio.run(self.async_scan_iter())
+
+    async def async_scan_callback(self):
+        """Test scan reports each address once to the callback as it is seen."""
+        first = MagicMock()
+        first.address = "00:11:22:33:44:55"
+        first.name = "Test Device"
+        second = MagicMock()
+        second.address = "66:77:88:99:AA:BB"
+        second.name = None
+        reported = []
+
+        with patch('src.device.ble_adapter._BLEAK_SCANNER_CLS', FakeCallbackScanner), \
+                patch.object(FakeCallbackScanner, 'advertisements', [first, second, first]):
+            adapter = BLEAdapter()
+            devices = await adapter.scan(timeout=0.01, callback=reported.append)
+
+            self.assertEqual([d.address for d in reported], [first.address, second.address])
+            self.assertEqual([d.address for d in devices], [d.address for d in reported])
+
+    def test_scan_callback(self):
+        """Run async test for scan callbacks."""
+        asyncio.run(self.async_scan_callback())
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,7 +1,9 @@
 import asyncio
 import unittest
+from unittest.mock import AsyncMock, patch
 
 from src.device.device_manager import DeviceManager, ConnectionType
+from src.device.mock_transport import MockTransport
 
 
 class DummySignal:
@@ -11,6 +13,14 @@ class DummySignal:
         self.raw_samples = None
 
 
+class DummySignalRawSamples:
+    decoded_data = None
+    data = None
+
+    def __init__(self, samples: bytearray):
+        self.raw_samples = samples
+
+
 class DummySignalNoPayload:
     decoded_data = None
     data = None
@@ -29,6 +39,20 @@ class TestDeviceManagerTransmit(unittest.TestCase):
 
         self.assertTrue(asyncio.run(runner()))
 
+    def test_transmit_signal_raw_samples_chunked(self):
+        async def runner():
+            manager = DeviceManager(enable_mock=True)
+            self.assertTrue(await manager.connect(ConnectionType.MOCK))
+            samples = bytearray(range(256)) * 10
+            result = await manager.transmit_signal(DummySignalRawSamples(samples))
+            sent = bytes(manager.active_transport._buffer)
+            await manager.disconnect()
+            return result, sent, bytes(samples)
+
+        result, sent, expected = asyncio.run(runner())
+        self.assertTrue(result)
+        self.assertEqual(sent, expected)
+
     def test_transmit_signal_without_payload(self):
         async def runner():
             manager = DeviceManager(enable_mock=True)
@@ -41,5 +65,41 @@ class TestDeviceManagerTransmit(unittest.TestCase):
         self.assertFalse(asyncio.run(runner()))
 
 
+class TestDeviceManagerScan(unittest.TestCase):
+    def test_scan_results_cached_and_coalesced(self):
+        async def runner():
+            manager = DeviceManager()
+            with patch.object(manager, "_scan_usb", AsyncMock(return_value=None)) as usb, \
+                    patch.object(manager, "_scan_ble", AsyncMock(return_value={"address": "AA"})) as ble:
+                first, second = await asyncio.gather(manager.scan_devices(), manager.scan_devices())
+                self.assertEqual(first, second)
+                self.assertEqual(ble.await_count, 1)
+                self.assertEqual(usb.await_count, 1)
+
+                manager.invalidate_scan_cache()
+                await manager.scan_devices()
+                self.assertEqual(ble.await_count, 2)
+
+        asyncio.run(runner())
+
+
+class TestMockTransport(unittest.TestCase):
+    def test_reads_advance_cursor_and_compact(self):
+        async def runner():
+            transport = MockTransport()
+            await transport.connect()
+            await transport.write(b"abcdefgh")
+            reads = [await transport.read(2)]
+            pending = (bytes(transport._buffer), transport._rd_pos)
+            await transport.write(b"ij")
+            reads += [await transport.read(3), await transport.read(), await transport.read()]
+            return reads, pending, transport._buffer
+
+        reads, pending, buffer = asyncio.run(runner())
+        self.assertEqual(reads, [b"ab", b"cde", b"fghij", b"OK"])
+        self.assertEqual(pending, (b"abcdefgh", 2))
+        self.assertEqual(buffer, b"")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,77 @@
+"""Unit tests for FlipperZeroBLE connection helpers."""
+
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.device.ble_adapter import BLEDeviceInfo
+from src.device.flipper_ble import FlipperZeroBLE
+
+
+def make_serial_service():
+    rx = MagicMock(uuid=FlipperZeroBLE.RX_CHAR_UUID)
+    tx = MagicMock(uuid=FlipperZeroBLE.TX_CHAR_UUID)
+    return MagicMock(uuid=FlipperZeroBLE.SERIAL_SERVICE_UUID.upper(), characteristics=[rx, tx])
+
+
+class TestFlipperZeroBLE(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        path_patch = patch.object(
+            FlipperZeroBLE, "LAST_DEVICE_FILE", Path(self._tmp.name) / "last_flipper.json"
+        )
+        path_patch.start()
+        self.addCleanup(path_patch.stop)
+
+    def test_last_address_round_trip(self):
+        flipper = FlipperZeroBLE()
+        self.assertIsNone(flipper._load_last_address())
+        flipper._save_last_address("80:E1:26:00:00:01")
+        self.assertEqual(flipper._load_last_address(), "80:E1:26:00:00:01")
+
+    def test_connect_uses_last_address_without_scanning(self):
+        async def runner():
+            flipper = FlipperZeroBLE()
+            flipper._save_last_address("80:E1:26:00:00:01")
+            with patch.object(flipper, "connect", AsyncMock(return_value=True)) as connect, \
+                    patch.object(flipper, "get_services", AsyncMock(return_value=[make_serial_service()])), \
+                    patch.object(flipper, "find_flipper", AsyncMock()) as find:
+                self.assertTrue(await flipper.connect_to_flipper())
+                find.assert_not_called()
+                self.assertEqual(connect.await_args.args[0], "80:E1:26:00:00:01")
+
+        asyncio.run(runner())
+
+    def test_connect_falls_back_to_scan(self):
+        async def runner():
+            flipper = FlipperZeroBLE()
+            flipper._save_last_address("80:E1:26:00:00:01")
+            device = MagicMock(address="80:E1:26:00:00:02")
+            with patch.object(flipper, "connect", AsyncMock(side_effect=[False, True])), \
+                    patch.object(flipper, "get_services", AsyncMock(return_value=[make_serial_service()])), \
+                    patch.object(flipper, "find_flipper", AsyncMock(return_value=device)):
+                self.assertTrue(await flipper.connect_to_flipper())
+            return flipper
+
+        flipper = asyncio.run(runner())
+        self.assertEqual(flipper._load_last_address(), "80:E1:26:00:00:02")
+
+    def test_find_flipper_stops_at_first_match(self):
+        async def runner():
+            flipper = FlipperZeroBLE()
+            match = BLEDeviceInfo("80:E1:26:00:00:03", "Flipper Zero", -50)
+            other = BLEDeviceInfo("AA:BB:CC:DD:EE:FF", "Phone", -40)
+            with patch.object(flipper, "scan", AsyncMock(return_value=[other, match])) as scan:
+                self.assertIs(await flipper.find_flipper(), match)
+            predicate = scan.await_args.kwargs["stop_predicate"]
+            self.assertTrue(predicate(match))
+            self.assertFalse(predicate(other))
+
+        asyncio.run(runner())
+
+
+if __name__ == "__main__":
+    unittest.main()
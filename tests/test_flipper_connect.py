@@ -14,10 +14,10 @@ async def main():
         print("No Flipper Zero found!")
         return
         
-    print(f"Found Flipper Zero: {device.get('name')} at {device.get('address')}")
+    print(f"Found Flipper Zero: {device.name} at {device.address}")
     print("Attempting to connect...")
     
-    if await flipper.connect_to_flipper(device.get('address')):
+    if await flipper.connect_to_flipper(device.address):
         print("Successfully connected!")
         print("Device info:", flipper.get_device_info())
         
@@ -0,0 +1,132 @@
+import asyncio
+import unittest
+
+from src.device.flipper_protocol import (
+    FlipperProtocol,
+    FlipperProtocolError,
+    MessageType,
+    RPCMessage,
+)
+
+
+class TestFlipperProtocolCodec(unittest.TestCase):
+    def setUp(self):
+        self.protocol = FlipperProtocol()
+
+    def test_round_trip(self):
+        message = RPCMessage(
+            type=MessageType.COMMAND,
+            command_id=42,
+            command="subghz_tx",
+            args={"frequency": 433920000, "preset": "OOK650"},
+            data=b"\x00\x01\x02",
+        )
+        decoded = self.protocol.decode_message(self.protocol.encode_message(message))
+        self.assertEqual(decoded, message)
+
+    def test_round_trip_without_args_or_data(self):
+        message = RPCMessage(MessageType.RESPONSE, 7, "ping", {})
+        decoded = self.protocol.decode_message(self.protocol.encode_message(message))
+        self.assertEqual(decoded.args, {})
+        self.assertIsNone(decoded.data)
+
+    def test_empty_args_are_not_shared(self):
+        encoded = self.protocol.encode_message(RPCMessage(MessageType.COMMAND, 3, "ping", {}))
+        first = self.protocol.decode_message(encoded)
+        first.args["mutated"] = True
+        self.assertEqual(self.protocol.decode_message(encoded).args, {})
+
+    def test_decode_rejects_short_message(self):
+        with self.assertRaises(FlipperProtocolError):
+            self.protocol.decode_message(b"\x00\x01")
+
+    def test_decode_rejects_bad_args(self):
+        encoded = bytearray(self.protocol.encode_message(
+            RPCMessage(MessageType.COMMAND, 1, "x", {"a": 1})
+        ))
+        encoded[-2] = ord("}")  # corrupt the JSON payload
+        with self.assertRaises(FlipperProtocolError):
+            self.protocol.decode_message(bytes(encoded))
+
+
+class LoopbackTransport:
+    """Answers every command with a response carrying the same id."""
+
+    def __init__(self, protocol, reply=True):
+        self.protocol = protocol
+        self.reply = reply
+
+    def write(self, data):
+        if not self.reply:
+            return
+        request = self.protocol.decode_message(data)
+        response = RPCMessage(MessageType.RESPONSE, request.command_id, request.command, {"ok": True})
+        asyncio.get_running_loop().call_soon(self.protocol.handle_response, response)
+
+
+def assert_no_pending(case, protocol):
+    case.assertTrue(all(future is None for future in protocol._responses))
+    case.assertEqual(protocol._overflow, {})
+
+
+class AsyncLoopbackTransport(LoopbackTransport):
+    """Same as LoopbackTransport but with FlipperTransport's async write."""
+
+    async def write(self, data):
+        super().write(data)
+        return len(data)
+
+
+class TestFlipperProtocolCommands(unittest.TestCase):
+    def test_send_command_resolves_and_cleans_up(self):
+        async def runner():
+            protocol = FlipperProtocol()
+            response = await protocol.send_command(LoopbackTransport(protocol), "ping")
+            await asyncio.sleep(0)
+            return protocol, response
+
+        protocol, response = asyncio.run(runner())
+        self.assertEqual(response.args, {"ok": True})
+        assert_no_pending(self, protocol)
+
+    def test_send_command_awaits_async_transport(self):
+        async def runner():
+            protocol = FlipperProtocol()
+            return await protocol.send_command(AsyncLoopbackTransport(protocol), "ping", timeout=1.0)
+
+        self.assertEqual(asyncio.run(runner()).args, {"ok": True})
+
+    def test_send_command_timeout_cleans_up(self):
+        async def runner():
+            protocol = FlipperProtocol()
+            with self.assertRaises(asyncio.TimeoutError):
+                await protocol.send_command(LoopbackTransport(protocol, reply=False), "ping", timeout=0.01)
+            await asyncio.sleep(0)
+            return protocol
+
+        assert_no_pending(self, asyncio.run(runner()))
+
+    def test_colliding_command_ids_both_resolve(self):
+        async def runner():
+            protocol = FlipperProtocol()
+            transport = LoopbackTransport(protocol, reply=False)
+            first = asyncio.ensure_future(protocol.send_command(transport, "a"))
+            await asyncio.sleep(0)
+            # Jump a full ring ahead so the next id lands in the same slot
+            protocol.command_id += len(protocol._responses) - 1
+            second = asyncio.ensure_future(protocol.send_command(transport, "b"))
+            await asyncio.sleep(0)
+            for cmd_id in (protocol.command_id, 1):
+                protocol.handle_response(RPCMessage(MessageType.RESPONSE, cmd_id, "", {"id": cmd_id}))
+            results = await asyncio.gather(first, second)
+            await asyncio.sleep(0)
+            return protocol, results
+
+        protocol, (first, second) = asyncio.run(runner())
+        self.assertEqual(first.args, {"id": 1})
+        self.assertEqual(second.args, {"id": 1 + len(protocol._responses)})
+        assert_no_pending(self, protocol)
+
+
+if __name__ == "__main__":
+    unittest.main()
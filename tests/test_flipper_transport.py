@@ -0,0 +1,363 @@
+"""Unit tests for the USB/BLE Flipper transports."""
+
+import asyncio
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.device.flipper_transport import FlipperBLETransport, FlipperUSBTransport
+
+
+class FakeSerial:
+    """pyserial stand-in that records which thread touched it."""
+
+    def __init__(self, incoming=b""):
+        self.is_open = True
+        self.timeout = 1.0
+        self.incoming = bytearray(incoming)
+        self.written = []
+        self.threads = set()
+
+    def write(self, data):
+        self.threads.add(threading.get_ident())
+        self.written.append(bytes(data))
+        return len(data)
+
+    def read(self, size=1):
+        self.threads.add(threading.get_ident())
+        chunk = bytes(self.incoming[:size])
+        del self.incoming[:size]
+        return chunk
+
+    def reset_input_buffer(self):
+        self.incoming.clear()
+
+    def close(self):
+        self.is_open = False
+
+
+class TestFlipperUSBTransport(unittest.TestCase):
+    def test_io_runs_off_the_event_loop(self):
+        async def runner():
+            transport = FlipperUSBTransport()
+            port = FakeSerial(b"pong")
+            transport._attach_serial(port)
+            self.assertEqual(await transport.write(b"ping"), 4)
+            self.assertEqual(await transport.read(4, timeout=0.2), b"pong")
+            self.assertEqual(port.timeout, 1.0)
+            self.assertTrue(await transport.disconnect())
+            return port
+
+        port = asyncio.run(runner())
+        self.assertEqual(port.written, [b"ping"])
+        self.assertNotIn(threading.get_ident(), port.threads)
+        self.assertEqual(len(port.threads), 1)
+        self.assertFalse(port.is_open)
+
+    def test_small_writes_are_coalesced(self):
+        async def runner():
+            transport = FlipperUSBTransport()
+            transport._attach_serial(port := FakeSerial())
+            for frame in (b"a", bytearray(b"b"), memoryview(b"c")):
+                await transport.write(frame)
+            await transport.flush()
+            await transport.disconnect()
+            return port
+
+        self.assertEqual(asyncio.run(runner()).written, [b"abc"])
+
+    def test_write_error_surfaces_on_flush(self):
+        async def runner():
+            transport = FlipperUSBTransport()
+            port = FakeSerial()
+            port.write = MagicMock(side_effect=OSError("unplugged"))
+            transport._attach_serial(port)
+            await transport.write(b"ping")
+            with self.assertRaises(ConnectionError):
+                await transport.flush()
+            transport._stop_tx_pump()
+
+        asyncio.run(runner())
+
+    def test_find_flipper_port_matches_known_ids(self):
+        ports = [
+            MagicMock(vid=0x1234, pid=0x0001, device="/dev/ttyACM0"),
+            MagicMock(vid=0x0483, pid=0x5740, device="/dev/ttyS0"),
+            MagicMock(vid=0x0483, pid=0x5740, device="/dev/ttyACM1"),
+        ]
+        with patch("serial.tools.list_ports.comports", return_value=ports), \
+                patch("src.device.flipper_transport._SYSTEM", "linux"):
+            self.assertEqual(FlipperUSBTransport.find_flipper_port(), ("/dev/ttyACM1", (0x0483, 0x5740)))
+
+    def test_connect_opens_requested_port(self):
+        async def runner():
+            transport = FlipperUSBTransport()
+            with patch("src.device.flipper_transport._MAKE_SERIAL") as make_serial:
+                make_serial.return_value = FakeSerial(b"stale")
+                self.assertTrue(await transport.connect(port="/dev/ttyACM0"))
+            await transport.disconnect()
+            return transport, make_serial
+
+        transport, make_serial = asyncio.run(runner())
+        make_serial.assert_called_once_with("/dev/ttyACM0")
+        self.assertEqual(make_serial.return_value.incoming, b"")
+        self.assertEqual(transport.port, "/dev/ttyACM0")
+
+    def test_connect_tolerates_unsupported_low_latency(self):
+        class MacSerial(FakeSerial):
+            def set_low_latency_mode(self, enabled):
+                raise NotImplementedError("Low latency not supported on this platform")
+
+        async def runner():
+            transport = FlipperUSBTransport()
+            with patch("src.device.flipper_transport._MAKE_SERIAL", return_value=MacSerial()):
+                self.assertTrue(await transport.connect(port="/dev/cu.usbmodemflip1"))
+            await transport.disconnect()
+
+        asyncio.run(runner())
+
+    def test_failed_prepare_closes_port(self):
+        async def runner():
+            transport = FlipperUSBTransport()
+            port = FakeSerial()
+            port.reset_input_buffer = MagicMock(side_effect=OSError("gone"))
+            with patch("src.device.flipper_transport._MAKE_SERIAL", return_value=port):
+                self.assertFalse(await transport.connect(port="/dev/ttyACM0"))
+            return port
+
+        self.assertFalse(asyncio.run(runner()).is_open)
+
+    def test_read_error_marks_transport_disconnected(self):
+        async def runner():
+            transport = FlipperUSBTransport()
+            port = FakeSerial()
+            port.read = MagicMock(side_effect=OSError("unplugged"))
+            transport._attach_serial(port)
+            with self.assertRaises(ConnectionError):
+                await transport.read(1)
+            with self.assertRaises(ConnectionError):
+                await transport.write(b"x")
+            transport._detach_serial()
+
+        asyncio.run(runner())
+
+    def test_read_requires_connection(self):
+        with self.assertRaises(ConnectionError):
+            asyncio.run(FlipperUSBTransport().read(1))
+
+
+class CountingServices(list):
+    def __iter__(self):
+        FakeBleakClient.service_walks += 1
+        return super().__iter__()
+
+    def get_characteristic(self, uuid):
+        if not FakeBleakClient.indexed:
+            return None
+        return MagicMock(
+            uuid=uuid,
+            properties=["write", "write-without-response"],
+            max_write_without_response_size=FakeBleakClient.packet_size,
+        )
+
+
+class FakeBleakClient:
+    """BleakClient stand-in exposing the Flipper serial characteristics."""
+
+    service_walks = 0
+    packet_size = 20
+    indexed = True
+
+    def __init__(self, address, disconnected_callback=None):
+        self.address = address
+        self.disconnected_callback = disconnected_callback
+        self.is_connected = False
+        self.notifying = []
+        self.writes = []
+
+    async def connect(self):
+        self.is_connected = True
+
+    async def disconnect(self):
+        self.is_connected = False
+
+    @property
+    def services(self):
+        rx = MagicMock(uuid=FlipperBLETransport.RX_CHAR_UUID.upper())
+        tx = MagicMock(uuid=FlipperBLETransport.TX_CHAR_UUID.upper())
+        return CountingServices([MagicMock(characteristics=[rx, tx])])
+
+    async def start_notify(self, uuid, handler):
+        self.notifying.append(uuid)
+
+    async def write_gatt_char(self, uuid, data, response=None):
+        self.writes.append((bytes(data), response))
+
+
+class TestFlipperBLETransport(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_file = Path(tmp.name) / "gatt_cache.json"
+        for patcher in (
+            patch.object(FlipperBLETransport, "GATT_CACHE_FILE", self.cache_file),
+            patch.object(FlipperBLETransport, "_gatt_cache", {}),
+            patch.object(FlipperBLETransport, "_gatt_cache_loaded", False),
+            patch("src.device.flipper_transport.BleakClient", FakeBleakClient),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        FakeBleakClient.service_walks = 0
+        FakeBleakClient.indexed = True
+
+    def test_reconnect_reuses_cached_characteristics(self):
+        async def runner():
+            self.assertTrue(await FlipperBLETransport().connect(address="80:E1:26:00:00:01"))
+            FlipperBLETransport._gatt_cache.clear()
+            FlipperBLETransport._gatt_cache_loaded = False  # simulate a cold start
+            transport = FlipperBLETransport()
+            self.assertTrue(await transport.connect(address="80:E1:26:00:00:01"))
+            return transport
+
+        with patch.object(
+            FlipperBLETransport, "_discover_characteristics", autospec=True,
+            side_effect=FlipperBLETransport._discover_characteristics,
+        ) as discover:
+            transport = asyncio.run(runner())
+        self.assertEqual(discover.call_count, 1)
+        self.assertTrue(self.cache_file.exists())
+        self.assertEqual(transport._client.notifying, [FlipperBLETransport.RX_CHAR_UUID])
+
+    def test_discovery_uses_characteristic_index(self):
+        asyncio.run(self._connected_transport())
+        self.assertEqual(FakeBleakClient.service_walks, 0)
+
+    def test_discovery_falls_back_to_service_walk(self):
+        FakeBleakClient.indexed = False
+        transport = asyncio.run(self._connected_transport())
+        self.assertEqual(FakeBleakClient.service_walks, 1)
+        self.assertEqual(transport._tx_char_uuid, FlipperBLETransport.TX_CHAR_UUID.upper())
+
+    def test_read_spans_notifications(self):
+        async def runner():
+            transport = await self._connected_transport()
+            for chunk in (b"he", b"llo", b" world"):
+                transport._notification_handler("rx", bytearray(chunk))
+            first = await transport.read(5, timeout=0.1)
+            rest = await transport.read(timeout=0.1)
+            empty = await transport.read(timeout=0.01)
+            return first, rest, empty
+
+        self.assertEqual(asyncio.run(runner()), (b"hello", b" world", b""))
+
+    def test_read_waits_for_notification(self):
+        async def runner():
+            transport = await self._connected_transport()
+            asyncio.get_running_loop().call_later(0.01, transport._notification_handler, "rx", bytearray(b"ok"))
+            return await transport.read(10, timeout=1.0)
+
+        self.assertEqual(asyncio.run(runner()), b"ok")
+
+    def test_notification_from_worker_thread(self):
+        async def runner():
+            transport = await self._connected_transport()
+            worker = threading.Thread(
+                target=transport._notification_handler, args=("rx", bytearray(b"threaded"))
+            )
+            worker.start()
+            worker.join()
+            return await transport.read(timeout=1.0)
+
+        self.assertEqual(asyncio.run(runner()), b"threaded")
+
+    def test_connect_negotiates_mtu(self):
+        async def runner():
+            transport = FlipperBLETransport()
+            backend = MagicMock(_acquire_mtu=AsyncMock())
+            with patch.object(FakeBleakClient, "mtu_size", 247, create=True), \
+                    patch.object(FakeBleakClient, "_backend", backend, create=True):
+                self.assertTrue(await transport.connect(address="80:E1:26:00:00:01"))
+            return transport, backend
+
+        transport, backend = asyncio.run(runner())
+        self.assertEqual(transport.mtu_size, 247)
+        backend._acquire_mtu.assert_awaited_once()
+
+    def test_write_splits_into_unacked_packets(self):
+        async def runner():
+            transport = await self._connected_transport()
+            self.assertEqual(await transport.write(bytes(range(45))), 45)
+            return transport._client.writes
+
+        writes = asyncio.run(runner())
+        self.assertEqual([len(data) for data, _ in writes], [20, 20, 5])
+        self.assertEqual({response for _, response in writes}, {False})
+        self.assertEqual(b"".join(data for data, _ in writes), bytes(range(45)))
+
+    def test_failed_packet_stops_the_write(self):
+        async def runner():
+            transport = await self._connected_transport()
+            client = transport._client
+            client.write_gatt_char = AsyncMock(side_effect=[None, OSError("gatt"), None])
+            with self.assertRaises(OSError):
+                await transport.write(bytes(range(45)))
+            return client.write_gatt_char
+
+        self.assertEqual(asyncio.run(runner()).await_count, 2)
+
+    def test_remote_disconnect_blocks_io(self):
+        async def runner():
+            transport = await self._connected_transport()
+            transport._client.disconnected_callback(transport._client)
+            with self.assertRaises(ConnectionError):
+                await transport.write(b"x")
+
+        asyncio.run(runner())
+
+    async def _connected_transport(self):
+        transport = FlipperBLETransport()
+        self.assertTrue(await transport.connect(address="80:E1:26:00:00:01"))
+        return transport
+
+
+class ReplayScanner:
+    """BleakScanner stand-in that replays one Flipper advertisement on start."""
+
+    starts = 0
+
+    def __init__(self, detection_callback=None, **kwargs):
+        self._callback = detection_callback
+
+    async def start(self):
+        ReplayScanner.starts += 1
+        self._callback(MagicMock(address="80:E1:26:00:00:02"), MagicMock(local_name="Flipper Zero"))
+
+    async def stop(self):
+        pass
+
+
+class TestFlipperBLEDiscovery(unittest.TestCase):
+    def setUp(self):
+        for patcher in (
+            patch.object(FlipperBLETransport, "_sightings", {}),
+            patch.dict("src.device.ble_adapter._SHARED_SCANNERS", clear=True),
+            patch("src.device.flipper_transport.BleakScanner", ReplayScanner),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        ReplayScanner.starts = 0
+
+    def test_recent_sighting_skips_rescan(self):
+        async def runner():
+            first = await FlipperBLETransport.find_flipper_device(timeout=1.0)
+            second = await FlipperBLETransport.find_flipper_device(timeout=1.0)
+            return first, second
+
+        self.assertEqual(asyncio.run(runner()), ("80:E1:26:00:00:02",) * 2)
+        self.assertEqual(ReplayScanner.starts, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
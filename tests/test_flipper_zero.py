@@ -0,0 +1,120 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.device.flipper_zero import FlipperMode, FlipperSignal, FlipperZeroDevice
+
+
+class TestSignalStorage(unittest.TestCase):
+    def setUp(self):
+        self.device = FlipperZeroDevice()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "signal.json")
+
+    def test_save_load_round_trip(self):
+        signal = FlipperSignal(
+            mode=FlipperMode.SUB_GHZ,
+            frequency=433.92,
+            modulation="AM",
+            protocol="Princeton",
+            data=bytes(range(256)),
+            metadata={"note": "garage", "nested": {"data": "not-a-payload"}},
+        )
+        self.assertTrue(self.device.save_signal(signal, self.path))
+        loaded = self.device.load_signal(self.path)
+        self.assertEqual(loaded, signal)
+
+    def test_nested_metadata_round_trips_with_both_backends(self):
+        # json-backed stand-in so the orjson branch runs without orjson installed
+        fake_orjson = SimpleNamespace(
+            OPT_INDENT_2=None,
+            dumps=lambda obj, option=None: json.dumps(obj).encode(),
+            loads=json.loads,
+        )
+        signal = FlipperSignal(
+            mode=FlipperMode.SUB_GHZ,
+            data=b"\x01\x02",
+            metadata={"capture": {"mode": "raw", "data": "zz-not-hex"}},
+        )
+        for backend in (None, fake_orjson):
+            with self.subTest(orjson=backend is not None), \
+                    patch("src.device.flipper_zero.orjson", backend):
+                self.assertTrue(self.device.save_signal(signal, self.path))
+                self.assertEqual(self.device.load_signal(self.path), signal)
+
+    def test_save_writes_base64(self):
+        signal = FlipperSignal(mode=FlipperMode.IR, data=b"\x00\xff" * 3)
+        self.device.save_signal(signal, self.path)
+        with open(self.path) as f:
+            stored = json.load(f)
+        self.assertEqual(stored["encoding"], "base64")
+        self.assertEqual(stored["data"], "AP8A/wD/")
+
+    def test_load_legacy_hex_file(self):
+        with open(self.path, "w") as f:
+            json.dump({"mode": "infrared", "data": "00ff", "metadata": {}}, f)
+        self.assertEqual(self.device.load_signal(self.path).data, b"\x00\xff")
+
+    def test_signal_defaults_are_not_shared(self):
+        first = FlipperSignal(mode=FlipperMode.NFC)
+        first.metadata["uid"] = "04A2"
+        self.assertEqual(FlipperSignal(mode=FlipperMode.NFC).metadata, {})
+        self.assertFalse(hasattr(first, "__dict__"))
+
+    def test_load_missing_file_returns_none(self):
+        self.assertIsNone(self.device.load_signal(self.path))
+
+
+class TestConnection(unittest.TestCase):
+    def test_reconnect_reuses_transport_and_disconnects(self):
+        async def runner():
+            device = FlipperZeroDevice()
+            usb = device._transport_usb
+            with patch.object(usb, "connect", AsyncMock(return_value=True)) as connect, \
+                    patch.object(usb, "disconnect", AsyncMock(return_value=True)) as disconnect, \
+                    patch.object(device, "_init_device", AsyncMock()):
+                self.assertTrue(await device.connect_usb("/dev/ttyACM0"))
+                self.assertTrue(await device.disconnect())
+                self.assertTrue(await device.connect_usb())
+            self.assertIs(device._transport, usb)
+            self.assertEqual(connect.await_args_list[0].kwargs, {"port": "/dev/ttyACM0"})
+            disconnect.assert_awaited_once()
+
+        asyncio.run(runner())
+
+    def test_reconnect_closes_previous_port(self):
+        async def runner():
+            device = FlipperZeroDevice()
+            ports = [MagicMock(), MagicMock()]
+            with patch("src.device.flipper_transport._MAKE_SERIAL", side_effect=ports), \
+                    patch.object(device, "_init_device", AsyncMock()):
+                self.assertTrue(await device.connect_usb("/dev/ttyACM0"))
+                self.assertTrue(await device.connect_usb("/dev/ttyACM0"))
+                ports[0].close.assert_called_once()
+                ports[1].close.assert_not_called()
+                self.assertIs(device._transport_usb._serial, ports[1])
+                await device.disconnect()
+
+        asyncio.run(runner())
+
+    def test_failed_init_closes_transport(self):
+        async def runner():
+            device = FlipperZeroDevice()
+            ble = device._transport_ble
+            with patch.object(ble, "connect", AsyncMock(return_value=True)), \
+                    patch.object(ble, "disconnect", AsyncMock(return_value=True)) as disconnect, \
+                    patch.object(device, "_init_device", AsyncMock(side_effect=TimeoutError)):
+                self.assertFalse(await device.connect_ble("80:E1:26:00:00:01"))
+            disconnect.assert_awaited_once()
+            self.assertFalse(device.connected)
+
+        asyncio.run(runner())
+
+
+if __name__ == "__main__":
+    unittest.main()
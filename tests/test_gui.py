@@ -1,29 +1,37 @@
 """Unit tests for UI functionality."""
 
+import asyncio
+import threading
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from src.main import HydraRemoteGUI
 
 class TestGUI(unittest.TestCase):
     """Test GUI initialization and basic functionality."""
-    
-    @patch('src.main.ThemedTk')
-    def test_gui_init(self, mock_themed_tk):
-        """Test GUI initialization with default config."""
+
+    def _make_gui(self):
+        """Create a GUI whose loop thread is shut down after the test."""
         gui = HydraRemoteGUI()
-        
+        self.addCleanup(gui._shutdown_async)
+        return gui
+
+    @patch('src.main.tk.Tk')
+    def test_gui_init(self, mock_tk):
+        """Test GUI initialization with default config."""
+        gui = self._make_gui()
+
         # Check window was created
-        mock_themed_tk.assert_called_once()
-        
+        mock_tk.assert_called_once()
+
         # Check window title was set
         gui.window.title.assert_called_once()
-        
+
         # Check geometry was set
         gui.window.geometry.assert_called_once()
-        
-    @patch('src.main.ThemedTk')
+
+    @patch('src.main.tk.Tk')
     @patch('src.main.load_config')
-    def test_gui_custom_config(self, mock_load_config, mock_themed_tk):
+    def test_gui_custom_config(self, mock_load_config, mock_tk):
         """Test GUI initialization with custom config."""
         # Mock custom config
         mock_load_config.return_value = {
@@ -34,19 +42,205 @@ class TestGUI(unittest.TestCase):
                     "width": 1000,
                     "height": 800
                 }
-            }
+            },
+            "ble": {"scan_timeout": 2.5}
         }
-        
-        gui = HydraRemoteGUI()
-        
-        # Check custom theme was used
-        mock_themed_tk.assert_called_once_with(theme="custom_theme")
-        
+
+        gui = self._make_gui()
+
+        # Check custom theme is applied once the window is idle
+        gui.window.after_idle.assert_called_once_with(gui._apply_theme, "custom_theme")
+        with patch('src.main.ThemedStyle') as mock_style:
+            gui._apply_theme("custom_theme")
+        mock_style.assert_called_once_with(gui.window)
+        mock_style.return_value.set_theme.assert_called_once_with("custom_theme")
+
         # Check custom title was set
         gui.window.title.assert_called_once_with("Custom Title")
-        
+
         # Check custom geometry was set
         gui.window.geometry.assert_called_once_with("1000x800")
+        self.assertEqual(gui._scan_timeout, 2.5)
+
+    @patch('src.main.tk.Tk')
+    def test_async_result_is_delivered_without_polling(self, mock_tk):
+        """Test finished tasks are handed to Tk via window.after."""
+        gui = self._make_gui()
+        gui.device_list = MagicMock()
+        gui.status_label = MagicMock()
+        delivered = threading.Event()
+        gui.window.after.side_effect = lambda *args: delivered.set()
+
+        async def scan():
+            return [MagicMock(address="80:E1:26:00:00:01"), MagicMock(address="80:E1:26:00:00:02")]
+
+        self.assertTrue(gui.thread.is_alive())  # started by __init__
+        gui._queue_async_task(scan(), on_result=gui._finish_scan)
+        self.assertTrue(delivered.wait(1.0))
+        gui.loop.call_soon_threadsafe(gui.loop.stop)
+
+        delay, callback = gui.window.after.call_args.args
+        self.assertEqual(delay, 0)
+        callback()
+        self.assertEqual(len(gui.devices), 2)
+        gui.device_list.insert.assert_called_once()
+        self.assertEqual(len(gui.device_list.insert.call_args.args), 3)
+        gui.status_label.config.assert_called_with(text="Found 2 devices")
+
+    @patch('src.main.tk.Tk')
+    def test_scan_streams_devices_into_list(self, mock_tk):
+        """Test devices are appended as found and the finish only adds stragglers."""
+        gui = self._make_gui()
+        gui.device_list = MagicMock()
+        gui.status_label = MagicMock()
+        first = MagicMock(address="80:E1:26:00:00:01")
+        first.name = "Flipper"
+        second = MagicMock(address="80:E1:26:00:00:02")
+        second.name = None
+
+        async def scan(timeout, callback):
+            callback(first)
+            return [first, second]
+
+        gui.ble = MagicMock(scan=AsyncMock(side_effect=scan))
+        gui._queue_async_task = MagicMock()
+        gui._start_scan()
+        self.assertTrue(gui.scanning)
+        asyncio.run(gui._queue_async_task.call_args.args[0])
+        gui.ble.scan.assert_awaited_once_with(timeout=gui._scan_timeout, callback=gui._on_device_found)
+
+        (_, add, device), (_, finish, *args) = (c.args for c in gui.window.after.call_args_list)
+        add(device)
+        gui.device_list.insert.assert_called_with("end", "Flipper (80:E1:26:00:00:01)")
+        finish(*args)
+        gui.device_list.insert.assert_called_with("end", "Unknown Device (80:E1:26:00:00:02)")
+        self.assertEqual(gui.device_list.insert.call_count, 2)
+        gui.device_list.delete.assert_called_once()
+        self.assertEqual(gui.devices, [first, second])
+        gui.status_label.config.assert_called_with(text="Found 2 devices")
+        self.assertFalse(gui.scanning)
+
+    @patch('src.main.tk.Tk')
+    def test_scan_error_ends_scan(self, mock_tk):
+        """Test a failed scan reports the error and re-enables scanning."""
+        gui = self._make_gui()
+        gui.status_label = MagicMock()
+        gui.ble = MagicMock(scan=AsyncMock(side_effect=OSError("no adapter")))
+        gui.scanning = True
+        asyncio.run(gui._async_scan())
+        _, finish, *args = gui.window.after.call_args.args
+        finish(*args)
+        gui.status_label.config.assert_called_once_with(text="Scan error: no adapter")
+        self.assertFalse(gui.scanning)
+
+    @patch('src.main.tk.Tk')
+    def test_result_burst_is_drained_by_one_callback(self, mock_tk):
+        """Test results finishing together share one Tk callback."""
+        gui = self._make_gui()
+        gui.status_label = MagicMock()
+        futures = [MagicMock(cancelled=MagicMock(return_value=False),
+                             exception=MagicMock(return_value=None),
+                             result=MagicMock(return_value=True)) for _ in range(3)]
+        for future in futures:
+            gui._on_task_done(future)
+        gui.window.after.assert_called_once_with(0, gui._drain_results)
+
+        gui._drain_results()
+        self.assertEqual(len(gui._results), 0)
+        for future in futures:
+            future.result.assert_called_once()
+        gui._on_task_done(futures[0])
+        self.assertEqual(gui.window.after.call_count, 2)
+
+    @patch('src.main.tk.Tk')
+    def test_connect_result_is_applied_on_tk_thread(self, mock_tk):
+        """Test coroutines post widget updates instead of touching widgets."""
+        gui = self._make_gui()
+        gui.status_label = MagicMock()
+        gui.ble = MagicMock(connect=AsyncMock(side_effect=OSError("gone")))
+        asyncio.run(gui._async_connect("80:E1:26:00:00:01"))
+        gui.status_label.config.assert_not_called()
+
+        delay, callback, *args = gui.window.after.call_args.args
+        self.assertEqual((delay, args), (0, ["80:E1:26:00:00:01", False, "gone"]))
+        callback(*args)
+        gui.status_label.config.assert_called_once_with(text="Connect error: gone")
+
+    @patch('src.main.tk.Tk')
+    def test_on_result_receives_task_result(self, mock_tk):
+        """Test a task's result handler runs without touching the scan state."""
+        gui = self._make_gui()
+        gui.device_list = MagicMock()
+        gui.scanning = True  # a streaming scan still running
+        on_result = MagicMock()
+        delivered = threading.Event()
+        gui.window.after.side_effect = lambda *args: delivered.set()
+
+        async def learn():
+            return ["button"]
+
+        gui._queue_async_task(learn(), on_result=on_result)
+        self.assertTrue(delivered.wait(1.0))
+        gui.loop.call_soon_threadsafe(gui.loop.stop)
+        gui._drain_results()
+        on_result.assert_called_once_with(["button"])
+        gui.device_list.insert.assert_not_called()
+        self.assertTrue(gui.scanning)
+        self.assertEqual(gui._tasks, {})
+
+    @patch('src.main.tk.Tk')
+    def test_shutdown_cancels_pending_tasks_and_closes_loop(self, mock_tk):
+        """Test run()'s cleanup stops the worker thread and closes the loop."""
+        gui = self._make_gui()
+        started = threading.Event()
+
+        async def forever():
+            started.set()
+            await asyncio.Event().wait()
+
+        gui._queue_async_task(forever())
+        self.assertTrue(started.wait(1.0))
+        gui._shutdown_async()
+        self.assertFalse(gui.thread.is_alive())
+        self.assertTrue(gui.loop.is_closed())
+        (task, _), = gui._results
+        self.assertTrue(task.cancelled())
+
+    @patch('src.main.tk.Tk')
+    def test_learned_buttons_are_inserted_at_once(self, mock_tk):
+        """Test learned IR buttons are written with a single Text insert."""
+        gui = self._make_gui()
+        gui.remote_buttons = MagicMock()
+        gui.log_text = MagicMock()
+        with patch.object(gui, "_queue_async_task") as queue_task:
+            gui._learn_remote()
+        queue_task.call_args.args[0].close()  # never awaited
+        show = queue_task.call_args.kwargs["on_result"]
+        show([MagicMock(protocol="NEC"), MagicMock(protocol="RC5")])
+        gui.remote_buttons.insert.assert_called_once_with("end", "Button 1: NEC\nButton 2: RC5\n")
+
+    @patch('src.main.tk.Tk')
+    def test_connect_failure_resets_buttons_via_set_states(self, mock_tk):
+        """Test button state transitions go through the cached configure bindings."""
+        gui = self._make_gui()
+        gui.status_label = MagicMock()
+        gui._button_config = {name: MagicMock() for name in gui._button_config}
+        gui._show_connect_result("80:E1:26:00:00:01", False, None)
+        for name, state in (("scan", "normal"), ("connect", "normal"), ("disconnect", "disabled")):
+            gui._button_config[name].assert_called_once_with(state=state)
+
+    @patch('src.main.tk.Tk')
+    def test_log_keeps_a_bounded_number_of_lines(self, mock_tk):
+        """Test log_message trims the oldest lines past LOG_MAX_LINES."""
+        gui = self._make_gui()
+        gui.log_text = MagicMock()
+        with patch.object(HydraRemoteGUI, "LOG_MAX_LINES", 3):
+            for i in range(4):
+                gui.log_message(f"line {i}")
+        gui.log_text.delete.assert_called_once_with("1.0", "2.0")
+        self.assertEqual(gui._log_lines, 3)
+        self.assertEqual(gui.log_text.see.call_count, 4)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -28,11 +28,20 @@ class TestMainSmoke(unittest.TestCase):
         config = load_config("/invalid/yaml")
         self.assertEqual(config, {})
 
-    @patch('src.main.ThemedTk')
-    def test_gui_initialization(self, mock_themed_tk):
+    @patch('src.main.tk.Tk')
+    def test_gui_initialization(self, mock_tk):
         """Test that GUI initializes without errors."""
         gui = HydraRemoteGUI()
-        mock_themed_tk.assert_called_once()
+        self.addCleanup(gui._shutdown_async)
+        mock_tk.assert_called_once()
+
+    @patch('src.main.ThemedStyle', None)
+    def test_themed_style_is_imported_on_first_use(self):
+        """Test ThemedStyle is resolved lazily and then cached."""
+        import src.main
+        from ttkthemes import ThemedStyle
+        self.assertIs(src.main._themed_style(), ThemedStyle)
+        self.assertIs(src.main.ThemedStyle, ThemedStyle)
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,226 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from src.device import subghz
+from src.device.subghz import (
+    DecodingType,
+    ModulationType,
+    SignalAnalyzer,
+    SubGHzProtocolInfo,
+    SubGHzProtocolRegistry,
+    SubGHzSignal,
+)
+
+
+def ook_samples(levels, width):
+    """Build complex OOK samples holding each on/off level for `width` samples."""
+    return np.repeat(np.asarray(levels, dtype=np.float32), width).astype(np.complex64)
+
+
+class TestSignalAnalyzer(unittest.TestCase):
+    def test_extract_pulses(self):
+        samples = ook_samples([0, 1, 0, 1, 1, 0], 10)
+        pulses = SignalAnalyzer.extract_pulses(samples)
+        self.assertIsInstance(pulses, np.ndarray)
+        self.assertEqual(pulses.tolist(), [10, 10, 20])
+
+    def test_extract_pulses_without_transitions(self):
+        self.assertEqual(len(SignalAnalyzer.extract_pulses(ook_samples([1, 1], 5))), 0)
+        self.assertEqual(len(SignalAnalyzer.extract_pulses(np.array([], dtype=np.complex64))), 0)
+
+    def test_detect_bit_rate_uses_most_common_pulse(self):
+        self.assertEqual(SignalAnalyzer.detect_bit_rate(np.array([4, 10, 10, 3, 10, 4])), 100000.0)
+        self.assertEqual(SignalAnalyzer.detect_bit_rate([2.5, 5.0, 2.5]), 400000.0)
+        self.assertEqual(SignalAnalyzer.detect_bit_rate(np.array([], dtype=np.intp)), 0.0)
+
+    def test_detect_bit_rate_with_long_idle_gap(self):
+        pulses = np.array([10, 10, 4, 50_000_000], dtype=np.int64)
+        with patch("src.device.subghz.np.bincount", side_effect=AssertionError) as bincount:
+            self.assertEqual(SignalAnalyzer.detect_bit_rate(pulses), 100000.0)
+        bincount.assert_not_called()
+
+    def test_fused_modulation_stats_match_numpy(self):
+        rng = np.random.default_rng(0)
+        samples = (rng.normal(size=500) + 1j * rng.normal(size=500)).astype(np.complex64)
+        fused = subghz._modulation_stats_loop(samples.real, samples.imag)
+        np.testing.assert_allclose(fused, subghz._modulation_stats_numpy(samples), rtol=1e-4)
+
+    def test_squared_threshold_loop_matches_numpy(self):
+        rng = np.random.default_rng(1)
+        samples = (rng.normal(size=200) + 1j * rng.normal(size=200)).astype(np.complex64)
+        fused = subghz._above_threshold_loop(samples.real, samples.imag, 0.8 * 0.8)
+        np.testing.assert_array_equal(fused, subghz._above_threshold_numpy(samples, 0.8))
+
+    def test_detect_modulation_constant_carrier_is_ook(self):
+        samples = np.full(64, 0.5 + 0j, dtype=np.complex64)
+        self.assertIs(SignalAnalyzer.detect_modulation(samples), ModulationType.OOK)
+
+    def test_decode_manchester_packs_whole_bytes(self):
+        bits = [1, 0, 1, 0, 0, 1, 0, 1, 1, 1, 1, 1, 0, 0, 0, 0, 1]  # 17 bits
+        pulses = [p for bit in bits for p in ((11, 10) if bit else (10, 11))]
+        pulses.append(10)  # unpaired trailing pulse
+        self.assertEqual(SignalAnalyzer.decode_manchester(np.array(pulses)), b"\xa5\xf0")
+
+    def test_decode_manchester_clock_ignores_short_outlier(self):
+        pulses = [9] + [11] * 15  # min() would put 11 outside the tolerance
+        self.assertEqual(SignalAnalyzer.decode_manchester(np.array(pulses)), b"\x00")
+
+    def test_decode_manchester_rejects_off_clock_pair(self):
+        self.assertIsNone(SignalAnalyzer.decode_manchester([10, 10, 10, 30]))
+        self.assertIsNone(SignalAnalyzer.decode_manchester([10]))
+
+
+class TestSubGHzProtocolRegistry(unittest.TestCase):
+    def setUp(self):
+        for patcher in (
+            patch.dict(SubGHzProtocolRegistry.PROTOCOLS),
+            patch.object(SubGHzProtocolRegistry, "_freq_index", None),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        SubGHzProtocolRegistry._lookup_protocol.cache_clear()
+        self.addCleanup(SubGHzProtocolRegistry._lookup_protocol.cache_clear)
+
+    def names(self, freq, **kwargs):
+        return [p.name for p in SubGHzProtocolRegistry.get_protocols_for_frequency(freq, **kwargs)]
+
+    def test_frequency_lookup_keeps_registry_order(self):
+        self.assertEqual(self.names(433.92), ["Princeton", "KeeLoq", "Nice FLO"])
+        self.assertEqual(self.names(434.0, tolerance=0.5), ["Princeton", "KeeLoq", "Nice FLO"])
+        self.assertEqual(self.names(390.05), ["Chamberlain"])
+        self.assertEqual(self.names(500.0), [])
+
+    def test_get_protocol_caches_lookups(self):
+        for _ in range(3):
+            self.assertEqual(SubGHzProtocolRegistry.get_protocol("KeeLoq").name, "KeeLoq")
+        self.assertIsNone(SubGHzProtocolRegistry.get_protocol("missing"))
+        info = SubGHzProtocolRegistry._lookup_protocol.cache_info()
+        self.assertEqual((info.hits, info.misses), (2, 2))
+
+    def test_frequency_lookup_sees_registered_protocols(self):
+        self.names(433.92)  # build the index
+        SubGHzProtocolRegistry.register_protocol("Test", SubGHzProtocolInfo(
+            name="Test", frequencies=[315.0, 433.9], modulation=ModulationType.OOK, bit_rate=1000,
+        ))
+        self.assertEqual(self.names(315.0), ["Test"])
+        self.assertEqual(self.names(433.92)[-1], "Test")
+        self.assertEqual(SubGHzProtocolRegistry.get_protocol("test").name, "Test")
+
+
+    def test_analyze_runs_each_decoder_once(self):
+        SubGHzProtocolRegistry.register_protocol("princeton_clone", SubGHzProtocolInfo(
+            name="Clone", frequencies=[433.92], modulation=ModulationType.ASK, bit_rate=2000,
+            decode_type=DecodingType.MANCHESTER,
+        ))
+        signal = SubGHzSignal(433.92, ModulationType.ASK)
+        signal.add_samples(ook_samples([0, 1, 0, 1, 0, 1, 0], 10))
+        decoder = MagicMock(return_value=None)
+        with patch.dict(subghz._DECODERS, {DecodingType.MANCHESTER: decoder}):
+            signal.analyze()
+        decoder.assert_called_once()
+        self.assertIsNone(signal.protocol)
+
+
+    def test_analyze_skips_pulse_work_without_candidates(self):
+        signal = SubGHzSignal(433.92, ModulationType.PSK)
+        signal.add_samples(ook_samples([0, 1, 0], 10))
+        with patch.object(SignalAnalyzer, "extract_pulses") as extract:
+            signal.analyze()
+        extract.assert_not_called()
+        self.assertNotIn("bit_rate", signal.metadata)
+
+
+class TestSubGHzSignal(unittest.TestCase):
+    def test_protocol_info_is_frozen_and_hashable(self):
+        info = SubGHzProtocolInfo("Test", [315.0], ModulationType.OOK, 1000)
+        self.assertEqual(info.frequencies, (315.0,))
+        self.assertIn(info, {info})
+        with self.assertRaises(AttributeError):
+            info.bit_rate = 2000
+        self.assertFalse(hasattr(info, "__dict__"))
+
+    def test_signal_has_no_instance_dict(self):
+        signal = SubGHzSignal(433.92e6, ModulationType.OOK)
+        with self.assertRaises(AttributeError):
+            signal.extra = True
+
+    def test_add_samples_joins_chunks_on_read(self):
+        signal = SubGHzSignal(433.92e6, ModulationType.OOK)
+        buffer = ook_samples([1, 0], 2)
+        signal.add_samples(buffer)
+        buffer[:] = 0  # receive buffer reused by the caller
+        signal.add_samples(ook_samples([1], 3))
+        self.assertEqual(np.abs(signal.raw_samples).tolist(), [1, 1, 0, 0, 1, 1, 1])
+        self.assertEqual(signal.raw_samples.dtype, np.complex64)
+        self.assertIs(signal.raw_samples, signal.raw_samples)
+
+    def test_samples_are_stored_as_complex64(self):
+        signal = SubGHzSignal(433.92e6, ModulationType.OOK)
+        signal.add_samples(np.array([1 + 1j, 0], dtype=np.complex128))
+        signal.add_samples(np.array([0.5, 0.25]))
+        self.assertEqual(signal.raw_samples.dtype, np.complex64)
+        self.assertEqual(signal.raw_samples.real.dtype, np.float32)
+        signal.raw_samples = np.zeros(4, dtype=np.complex128)
+        self.assertEqual(signal.raw_samples.dtype, np.complex64)
+
+
+class TestSubGHzSignalFile(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "remote.json"
+
+    def test_round_trip_keeps_samples_binary(self):
+        signal = SubGHzSignal(433.92e6, ModulationType.OOK)
+        signal.raw_samples = ook_samples([0, 1, 0], 4)
+        signal.decoded_data = b"\xa5"
+        signal.protocol = "Princeton"
+        signal.metadata = {"source": "test", "bit_rate": np.float32(2000.0)}
+        self.assertTrue(signal.to_file(self.path))
+        self.assertEqual(self.path.read_bytes()[:2], b"PK")
+
+        loaded = SubGHzSignal.from_file(self.path)
+        np.testing.assert_array_equal(loaded.raw_samples, signal.raw_samples)
+        self.assertEqual(loaded.raw_samples.dtype, np.complex64)
+        self.assertEqual(loaded.decoded_data, b"\xa5")
+        self.assertEqual(loaded.protocol, "Princeton")
+        self.assertEqual(loaded.metadata, {"source": "test", "bit_rate": 2000.0})
+
+    def test_quantized_round_trip(self):
+        signal = SubGHzSignal(433.92e6, ModulationType.OOK)
+        rng = np.random.default_rng(2)
+        signal.raw_samples = (rng.normal(size=256) + 1j * rng.normal(size=256)) * 0.3
+        self.assertTrue(signal.to_file(self.path, quantize=True))
+
+        loaded = SubGHzSignal.from_file(self.path)
+        self.assertEqual(loaded.raw_samples.dtype, np.complex64)
+        peak = np.abs(signal.raw_samples.view(np.float32)).max()
+        np.testing.assert_allclose(loaded.raw_samples, signal.raw_samples, atol=peak / 127)  # half a step per component
+
+        signal.raw_samples = np.zeros(0, dtype=np.complex64)
+        self.assertTrue(signal.to_file(self.path, quantize=True))
+        self.assertEqual(len(SubGHzSignal.from_file(self.path).raw_samples), 0)
+
+    def test_loads_legacy_hex_json(self):
+        samples = ook_samples([1, 0], 2)
+        self.path.write_text(json.dumps({
+            "frequency": 315e6,
+            "modulation": "FSK",
+            "raw_samples": samples.tobytes().hex(),
+            "decoded_data": None,
+            "protocol": None,
+            "metadata": {},
+        }))
+        loaded = SubGHzSignal.from_file(self.path)
+        self.assertIs(loaded.modulation, ModulationType.FSK)
+        np.testing.assert_array_equal(loaded.raw_samples, samples)
+        self.assertIsNone(loaded.decoded_data)
+
+
+if __name__ == "__main__":
+    unittest.main()